@@ -0,0 +1,293 @@
+# Rebuild the figures of every venue folder from their scripts.
+#
+# Usage: python build_figures.py [venue ...] [-j N] [-n] [-B] [-v]
+#
+# Figure scripts are found under each venue folder and scanned, without
+# running them, for the files they name. String literals (and f-strings
+# over constants assigned once in the script) ending in .tex or .pgf are
+# outputs; those naming an existing file next to the script are inputs.
+# Files the scan cannot see are declared in comment lines of the script:
+#
+#   # Inputs: ranks/model1.npy ranks/model2.npy
+#   # Outputs: bar_hillel_repair_2.tex
+#
+# Scripts with no outputs (ones that only print or show a plot) are left
+# alone. A script is stale when an output is missing, when its inputs
+# (itself, the files it reads, the figtools sources) changed since its last
+# successful build, when its last run failed, or when a script producing one
+# of its inputs is stale.
+# Stale scripts run in their own folder, in a pool with one worker per core,
+# each as soon as the scripts producing its inputs are done.
+#
+# Only the standard library is imported here, so a no-op rebuild costs one
+# parse of each script plus a stat of each file it names.
+
+import argparse
+import ast
+import glob
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+VENUES = ['popl2025', 'popl2026', 'splash2024', 'tacas2025', 'lafi2024', 'lafi2026']
+OUTPUT_SUFFIXES = ('.tex', '.pgf')
+LIBRARY = os.path.join(ROOT, 'figtools')
+STATE_FILE = os.path.join(ROOT, '.figstore', 'build.json')
+DECLARATION = re.compile(r'^#\s*(Inputs|Outputs):(.*)$', re.MULTILINE)
+FILENAME = re.compile(r'^[\w.\-/]+\.\w+$')
+# Scripts run one per core, so neither their numeric libraries nor the
+# figtools bootstrap should start threads or processes of their own
+THREAD_ENV = {'OMP_NUM_THREADS': '1', 'OPENBLAS_NUM_THREADS': '1', 'MKL_NUM_THREADS': '1',
+              'FIGTOOLS_WORKERS': '1'}
+# State entry of a script whose last run failed; it stays stale until it succeeds
+FAILED = 'failed'
+
+
+@dataclass
+class Script:
+    path: str
+    inputs: list
+    outputs: list
+    deps: set = field(default_factory=set)  # scripts producing one of the inputs
+
+    @property
+    def name(self):
+        return os.path.relpath(self.path, ROOT)
+
+
+def _constants(tree):
+    """Names assigned exactly once in `tree`, to a str or int literal."""
+    values, counts = {}, {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign)):
+            for target in node.targets if isinstance(node, ast.Assign) else [node.target]:
+                if isinstance(target, ast.Name):
+                    counts[target.id] = counts.get(target.id, 0) + 1
+                    if isinstance(node.value, ast.Constant) and isinstance(node.value.value, (str, int)):
+                        values[target.id] = node.value.value
+    return {name: value for name, value in values.items() if counts[name] == 1}
+
+
+def _strings(tree):
+    """String literals in `tree`, with f-strings filled in where every field is a known constant."""
+    constants = _constants(tree)
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Constant) and isinstance(node.value, str):
+            yield node.value
+        elif isinstance(node, ast.JoinedStr):
+            parts = []
+            for value in node.values:
+                if isinstance(value, ast.Constant):
+                    parts.append(str(value.value))
+                elif (isinstance(value, ast.FormattedValue) and isinstance(value.value, ast.Name)
+                      and value.value.id in constants and value.conversion == -1 and value.format_spec is None):
+                    parts.append(str(constants[value.value.id]))
+                else:
+                    break
+            else:
+                yield ''.join(parts)
+
+
+def scan(path):
+    """Script for the figure script at `path`, or None if it writes no figure."""
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    folder = os.path.dirname(path)
+    inputs, outputs = {path}, set()
+    for name in _strings(ast.parse(source, path)):
+        if not FILENAME.match(name):
+            continue
+        full = os.path.normpath(os.path.join(folder, name))
+        if name.endswith(OUTPUT_SUFFIXES):
+            outputs.add(full)
+        elif os.path.isfile(full) and not name.endswith('.py'):
+            inputs.add(full)
+    for kind, names in DECLARATION.findall(source):
+        (inputs if kind == 'Inputs' else outputs).update(os.path.normpath(os.path.join(folder, name))
+                                                         for name in names.split())
+    if not outputs:
+        return None
+    if 'figtools' in source:
+        inputs.update(glob.glob(os.path.join(LIBRARY, '*.py')))
+    return Script(path, sorted(inputs - outputs), sorted(outputs))
+
+
+def discover(venues=VENUES):
+    """Figure scripts of `venues`, with `deps` linking each to the scripts producing its inputs."""
+    scripts = []
+    for venue in venues:
+        for path in sorted(glob.glob(os.path.join(ROOT, venue, '**', '*.py'), recursive=True)):
+            script = scan(path)
+            if script is not None:
+                scripts.append(script)
+    producer = {}
+    for script in scripts:
+        for output in script.outputs:
+            if output in producer:
+                raise ValueError(f'{os.path.relpath(output, ROOT)} is written by both '
+                                 f'{producer[output].name} and {script.name}')
+            producer[output] = script
+    for script in scripts:
+        script.deps = {producer[i].path for i in script.inputs if i in producer and producer[i] is not script}
+    return scripts
+
+
+def topological(scripts):
+    """`scripts` ordered so every script comes after the ones it depends on."""
+    by_path = {s.path: s for s in scripts}
+    order, state = [], {}
+
+    def visit(script, chain):
+        if state.get(script.path) == 'done':
+            return
+        if state.get(script.path) == 'visiting':
+            raise ValueError('dependency cycle: ' + ' -> '.join(s.name for s in chain + [script]))
+        state[script.path] = 'visiting'
+        for dep in sorted(script.deps):
+            if dep in by_path:
+                visit(by_path[dep], chain + [script])
+        state[script.path] = 'done'
+        order.append(script)
+
+    for script in scripts:
+        visit(script, [])
+    return order
+
+
+def signature(script):
+    """(path, size, mtime) of every input; None if one is missing."""
+    try:
+        return [[os.path.relpath(p, ROOT), st.st_size, st.st_mtime_ns]
+                for p, st in ((p, os.stat(p)) for p in script.inputs)]
+    except FileNotFoundError:
+        return None
+
+
+def load_state():
+    try:
+        with open(STATE_FILE) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(state):
+    os.makedirs(os.path.dirname(STATE_FILE), exist_ok=True)
+    tmp = f'{STATE_FILE}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(state, f, indent=1, sort_keys=True)
+    os.replace(tmp, STATE_FILE)
+
+
+def up_to_date(script, state):
+    """True if every output exists and no input changed since the last successful build.
+
+    Scripts whose last run failed are never up to date. Scripts never built
+    by this driver compare mtimes instead: outputs must be newer than every
+    input.
+    """
+    if state.get(script.name) == FAILED:
+        return False
+    try:
+        oldest = min(os.stat(p).st_mtime_ns for p in script.outputs)
+    except FileNotFoundError:
+        return False
+    current = signature(script)
+    if current is None:
+        return False
+    if script.name in state:
+        return state[script.name] == current
+    return all(mtime <= oldest for _, _, mtime in current)
+
+
+def stale(scripts, state, always=False):
+    """Paths of the scripts to run, including those downstream of one that runs."""
+    out = set()
+    for script in topological(scripts):
+        if always or script.deps & out or not up_to_date(script, state):
+            out.add(script.path)
+    return out
+
+
+def run(script):
+    """Run `script` in its folder; (script, returncode, seconds, output)."""
+    start = time.perf_counter()
+    env = {**os.environ, **THREAD_ENV, 'MPLBACKEND': 'Agg'}  # headless, so plt.show() returns at once
+    proc = subprocess.run([sys.executable, os.path.basename(script.path)], cwd=os.path.dirname(script.path),
+                          env=env, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                          text=True)
+    return script, proc.returncode, time.perf_counter() - start, proc.stdout
+
+
+def build(scripts, todo, jobs=None, verbose=False):
+    """Run the scripts in `todo` in dependency order, `jobs` at a time; returns the failed paths."""
+    state = load_state()
+    pending = {s.path: s for s in scripts if s.path in todo}
+    waiting = {path: {d for d in s.deps if d in pending} for path, s in pending.items()}
+    failed, running = set(), {}
+    with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as pool:
+        while waiting or running:
+            for path in [p for p, deps in waiting.items() if not deps]:
+                del waiting[path]
+                running[pool.submit(run, pending[path])] = path
+            if not running:
+                # Everything left waits on a failed script
+                for path in waiting:
+                    print(f'skipped {pending[path].name}: an input failed to build')
+                    failed.add(path)
+                break
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                del running[future]
+                script, code, seconds, output = future.result()
+                if code == 0:
+                    print(f'built {script.name} ({seconds:.1f}s)')
+                    if verbose and output:
+                        print(output.rstrip())
+                    state[script.name] = signature(script)
+                    for deps in waiting.values():
+                        deps.discard(script.path)
+                else:
+                    print(f'FAILED {script.name} (exit {code}):\n{output.rstrip()}')
+                    failed.add(script.path)
+                    state[script.name] = FAILED
+    save_state(state)
+    return failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild stale figures of every venue, in parallel.')
+    parser.add_argument('venues', nargs='*', default=VENUES, help='venue folders (default: %(default)s)')
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count(), help='scripts run at once')
+    parser.add_argument('-n', '--dry-run', action='store_true', help='list stale scripts without running them')
+    parser.add_argument('-B', '--always-make', action='store_true', help='treat every script as stale')
+    parser.add_argument('-v', '--verbose', action='store_true', help='show script output and the graph')
+    args = parser.parse_args(argv)
+
+    scripts = discover(args.venues)
+    todo = stale(scripts, load_state(), args.always_make)
+    if args.verbose:
+        for script in scripts:
+            print(f'{script.name}: {" ".join(os.path.relpath(p, ROOT) for p in script.outputs)}'
+                  f'{" (stale)" if script.path in todo else ""}')
+    if args.dry_run:
+        for script in topological(scripts):
+            if script.path in todo:
+                print(script.name)
+        return 0
+    if not todo:
+        print(f'{len(scripts)} figure scripts up to date')
+        return 0
+    failed = build(scripts, todo, args.jobs, args.verbose)
+    print(f'{len(todo) - len(failed)} built, {len(scripts) - len(todo)} up to date, {len(failed)} failed')
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+# Shared loaders and helpers for the figure scripts under latex/.
+#
+# Figure scripts live in per-venue folders and are run from their own
+# directory, so they put latex/ on sys.path before importing this package:
+#
+#   import os, sys
+#   sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+#   from figtools import load_csv
+#
+# Submodules are imported on first use of one of their names, so a script
+# that needs only the pgfplots writer does not pay for pandas or scipy.
+
+import importlib
+
+# The ecdf function shares its name with its submodule, which importing
+# figtools.ecdf (pgfplots does) binds here, so the function is bound up front
+ecdf = importlib.import_module('figtools.ecdf').ecdf
+
+# Public name -> submodule defining it
+_EXPORTS = {
+    'PatkBands': 'bootstrap',
+    'bootstrap_grouped_mean': 'bootstrap',
+    'bootstrap_patk': 'bootstrap',
+    'load_csv': 'cache',
+    'parse_durations': 'durations',
+    'StepECDF': 'ecdf',
+    'ecdf': 'ecdf',
+    'threshold_table': 'ecdf',
+    'EditTable': 'edits',
+    'decode_edits': 'edits',
+    'read_edits': 'edits',
+    'ingest_csv': 'ingest',
+    'LatencyTable': 'latency',
+    'LogHistogram': 'latency',
+    'latency_table': 'latency',
+    'read_latency_table': 'latency',
+    'RepairRecord': 'logparse',
+    'iter_repair_records': 'logparse',
+    'parse_kotlin_map': 'logparse',
+    'read_repair_log': 'logparse',
+    'evict': 'memo',
+    'stage': 'memo',
+    'outcome_flows': 'outcomes',
+    'PatkCube': 'patk',
+    'parse_patk': 'patk',
+    'patk_from_records': 'patk',
+    'Axis': 'pgfplots',
+    'LengthPrecision': 'precision',
+    'SampleEfficiency': 'precision',
+    'sample_efficiency': 'precision',
+    'topk_by_length': 'precision',
+    'list_models': 'ranks',
+    'load_models': 'ranks',
+    'load_ranks': 'ranks',
+    'save_ranks': 'ranks',
+    'read_harness_csv': 'readers',
+    'ScalingFit': 'scaling',
+    'fit_scaling': 'scaling',
+    'ParallelScaling': 'speedup',
+    'fit_amdahl': 'speedup',
+    'fit_gustafson': 'speedup',
+    'parallel_scaling': 'speedup',
+    'grouped_moments': 'stats',
+    'grouped_t_interval': 'stats',
+    'outlier_mask': 'stats',
+    'save_hybrid': 'tikz',
+    'save_tikz': 'tikz',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(importlib.import_module(f'figtools.{_EXPORTS[name]}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
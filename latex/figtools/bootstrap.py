@@ -0,0 +1,172 @@
+# Percentile bootstrap bands for binned means and P@k curves.
+#
+# Resamples are drawn in fixed-size chunks, each with its own child of one
+# SeedSequence, so the bands depend only on `seed` and never on how many
+# worker processes split the chunks. Within a chunk, resamples are drawn as
+# (batch, n) index matrices and reduced with one NumPy call per batch.
+#
+# P@k only depends on how many instances fall in each (first k, first budget)
+# outcome cell, so its resamples are drawn as multinomial counts over those
+# cells instead of index matrices: the same distribution, at a cost that does
+# not grow with the number of instances.
+#
+# Resampling runs in-process unless a worker count is asked for, either as
+# `workers` or through FIGTOOLS_WORKERS: figure scripts are often run many
+# at a time (build_figures.py runs one per core), and a pool started at the
+# top level of a script without a __main__ guard breaks under spawn.
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from figtools.precision import first_k_index
+
+# Resamples per seeded chunk; changing it changes the bands drawn for a seed.
+CHUNK_RESAMPLES = 64
+# Upper bound on the number of entries in one batched index matrix.
+BATCH_ENTRIES = 1 << 22
+# Worker processes used when `workers` is None; 0 means one per CPU.
+WORKERS_ENV = 'FIGTOOLS_WORKERS'
+
+_shared = None
+
+
+def _init_worker(shared):
+    global _shared
+    _shared = shared
+
+
+def _run_chunk(task, seed, size):
+    return task(_shared, np.random.default_rng(seed), size)
+
+
+def run_resamples(task, shared, n_resamples, seed=0, workers=None):
+    """Stack task(shared, rng, size) over chunks covering `n_resamples` resamples.
+
+    `task` must be a module-level function returning an array with `size`
+    rows. Chunks run in a process pool of `workers` processes, or in this
+    process if that is 1 (the default, unless FIGTOOLS_WORKERS says
+    otherwise); 0 means one per CPU. `shared` is sent to each worker once.
+    Scripts that use a pool must guard their body with
+    `if __name__ == '__main__':`.
+    """
+    if n_resamples < 1:
+        raise ValueError(f'n_resamples must be at least 1, got {n_resamples}')
+    sizes = [CHUNK_RESAMPLES] * (n_resamples // CHUNK_RESAMPLES)
+    if n_resamples % CHUNK_RESAMPLES:
+        sizes.append(n_resamples % CHUNK_RESAMPLES)
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers is None:
+        workers = int(os.environ.get(WORKERS_ENV, 1))
+    workers = min(workers or os.cpu_count() or 1, len(sizes))
+
+    if workers <= 1:
+        _init_worker(shared)
+        try:
+            return np.concatenate([_run_chunk(task, s, n) for s, n in zip(seeds, sizes)])
+        finally:
+            _init_worker(None)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(shared,)) as pool:
+        return np.concatenate(list(pool.map(_run_chunk, [task] * len(sizes), seeds, sizes)))
+
+
+def percentile_band(replicates, confidence=0.95):
+    """(low, high) percentile bounds over the first axis of `replicates`."""
+    alpha = (1 - confidence) / 2
+    return np.nanquantile(replicates, [alpha, 1 - alpha], axis=0)
+
+
+def _grouped_mean_task(shared, rng, size):
+    values, starts, counts = shared
+    column_start = np.repeat(starts, counts)
+    column_count = np.repeat(counts, counts).astype(np.uint64)
+    batch = max(1, BATCH_ENTRIES // max(len(values), 1))
+    out = np.empty((size, len(counts)))
+    for i in range(0, size, batch):
+        b = min(batch, size - i)
+        # Scale 32 random bits by the group size (multiply-shift); much cheaper
+        # than integers() with a per-column bound, and the bias is below 2**-32 per row.
+        idx = rng.integers(0, 1 << 32, size=(b, len(values)), dtype=np.uint32).astype(np.uint64)
+        idx *= column_count
+        idx >>= np.uint64(32)
+        idx = idx.view(np.int64)
+        idx += column_start
+        out[i:i + b] = np.add.reduceat(values[idx], starts, axis=1) / counts
+    return out
+
+
+def bootstrap_grouped_mean(df, by, column, n_resamples=10000, confidence=0.95, seed=0, workers=None):
+    """Mean and percentile bootstrap interval of `column` for every group.
+
+    Each resample redraws the rows of every group with replacement, keeping
+    the group sizes fixed. NaN values are ignored. Returns a frame with the
+    group keys as columns plus count, mean, low and high, like
+    grouped_t_interval.
+    """
+    x = df[column].to_numpy(dtype=np.float64)
+    code = df.groupby(by, observed=True, sort=True, dropna=True).ngroup().to_numpy()
+    kept = (code >= 0) & ~np.isnan(x)
+    order = np.argsort(code[kept], kind='stable')
+    values, code = x[kept][order], code[kept][order]
+
+    _, starts, counts = np.unique(code, return_index=True, return_counts=True)
+    replicates = run_resamples(_grouped_mean_task, (values, starts, counts), n_resamples, seed, workers)
+    low, high = percentile_band(replicates, confidence)
+
+    index = df[kept].groupby(by, observed=True, sort=True).size().index
+    return pd.DataFrame({
+        'count': counts,
+        'mean': np.add.reduceat(values, starts) / counts,
+        'low': low,
+        'high': high,
+    }, index=index).reset_index()
+
+
+@dataclass
+class PatkBands:
+    """P@k within each budget with percentile bootstrap bounds, shape (ks, budgets)."""
+    ks: np.ndarray
+    budgets: np.ndarray
+    estimate: np.ndarray
+    low: np.ndarray
+    high: np.ndarray
+
+    def band(self, k):
+        """(estimate, low, high) across budgets for one k."""
+        i = np.searchsorted(self.ks, k)
+        return self.estimate[i], self.low[i], self.high[i]
+
+
+def _patk_task(shared, rng, size):
+    n, p, shape = shared
+    counts = rng.multinomial(n, p, size=size).reshape(size, *shape)
+    # Hits at (k, budget) are all instances whose first k and first budget are no larger.
+    return np.cumsum(np.cumsum(counts, axis=1), axis=2)[:, :-1, :-1] / n
+
+
+def bootstrap_patk(time_ms, rank, budgets, ks=(1, 5, 10), rank_base=0, n_resamples=10000,
+                   confidence=0.95, seed=0, workers=None):
+    """P@k reached within each time budget, with percentile bootstrap bands.
+
+    An instance counts for (k, budget) when its human repair was ranked in the
+    top k and found within `budget` ms. Ranks below `rank_base` and NaN or
+    infinite times mean the repair was never found.
+    """
+    time_ms = np.asarray(time_ms, dtype=np.float64)
+    budgets = np.unique(np.asarray(budgets))
+    ks = np.unique(np.asarray(ks, dtype=np.int64))
+    n = len(time_ms)
+
+    k_index = first_k_index(rank, ks, rank_base)
+    found = np.isfinite(time_ms)
+    b_index = np.where(found, np.searchsorted(budgets, np.where(found, time_ms, 0), side='left'), len(budgets))
+    shape = (len(ks) + 1, len(budgets) + 1)
+    counts = np.bincount(k_index * shape[1] + b_index, minlength=shape[0] * shape[1])
+
+    estimate = np.cumsum(np.cumsum(counts.reshape(shape), axis=0), axis=1)[:-1, :-1] / max(n, 1)
+    replicates = run_resamples(_patk_task, (n, counts / max(n, 1), shape), n_resamples, seed, workers)
+    low, high = percentile_band(replicates, confidence)
+    return PatkBands(ks, budgets, estimate, low, high)
@@ -0,0 +1,240 @@
+# Columnar on-disk cache for the experiment CSVs.
+#
+# The first time a CSV is read it is parsed as usual and every column is
+# written to its own .npy file. Later reads memory-map those arrays instead of
+# re-parsing the text.
+#
+# load_csv keeps parsed tables in a content-addressed store shared by every
+# venue folder: latex/.figstore/objects/<content hash>-<reader key>/. The same
+# CSV copied under popl2025/, splash2024/, ... is therefore parsed once. Each
+# source path has a small record in .figstore/paths/ that remembers its size,
+# mtime and inode along with its hash, so the file is only re-hashed when one
+# of those changes.
+#
+# Store objects are immutable once published: save_frame never replaces an
+# existing entry, since other processes may be memory-mapping it. The only
+# entries updated in place are ingest_csv's per-source caches under
+# .figcache/, and those are changed only while holding locked(dirpath).
+
+import contextlib
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+CACHE_DIR = '.figcache'
+STORE_DIR = os.environ.get(
+    'FIGTOOLS_STORE', os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.figstore'),
+)
+META_FILE = 'meta.json'
+# Bump when the on-disk layout changes so stale entries are rebuilt.
+FORMAT_VERSION = 1
+
+
+def file_digest(path, chunk_size=1 << 20):
+    """Content hash of a file, read in fixed-size chunks."""
+    h = hashlib.blake2b(digest_size=16)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def source_stamp(path):
+    st = os.stat(path)
+    return {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+
+
+def reader_key(reader, kwargs):
+    """Stable key for a reader function and its keyword arguments."""
+    name = getattr(reader, '__module__', '') + '.' + getattr(reader, '__qualname__', repr(reader))
+    blob = json.dumps([name, sorted((k, repr(v)) for k, v in kwargs.items())])
+    return hashlib.blake2b(blob.encode(), digest_size=6).hexdigest()
+
+
+def cache_path(path, key):
+    """Per-source cache directory for `path`, used for tables that are updated in place."""
+    path = os.path.abspath(path)
+    return os.path.join(os.path.dirname(path), CACHE_DIR, f'{os.path.basename(path)}.{key}')
+
+
+def object_path(digest, key, store=None):
+    """Store directory holding the table parsed from content `digest` with reader `key`."""
+    return os.path.join(store or STORE_DIR, 'objects', f'{digest}-{key}')
+
+
+def dataset_digest(path, store=None):
+    """Content hash of `path`, re-hashing only when its size, mtime or inode changed."""
+    path = os.path.abspath(path)
+    name = hashlib.blake2b(path.encode(), digest_size=16).hexdigest()
+    record_path = os.path.join(store or STORE_DIR, 'paths', name + '.json')
+    stamp = source_stamp(path)
+    try:
+        with open(record_path) as f:
+            record = json.load(f)
+        if record['path'] == path and record['stamp'] == stamp:
+            return record['digest']
+    except (OSError, ValueError, KeyError):
+        pass
+    record = {'path': path, 'stamp': stamp, 'digest': file_digest(path)}
+    os.makedirs(os.path.dirname(record_path), exist_ok=True)
+    tmp = f'{record_path}.{os.getpid()}.tmp'
+    with open(tmp, 'w') as f:
+        json.dump(record, f)
+    os.replace(tmp, record_path)
+    return record['digest']
+
+
+def save_frame(df, dirpath, meta=None, overwrite=False):
+    """Write each column of `df` as its own .npy file and publish them atomically as `dirpath`.
+
+    Numeric, boolean and datetime columns are stored as-is. Everything else is
+    stored as a fixed-width unicode array plus a null mask, if it has nulls.
+    An existing entry is kept and the new copy discarded, so readers never
+    see an entry vanish; returns True if this call published `dirpath`.
+    overwrite=True replaces the entry instead, for callers holding
+    locked(dirpath).
+    """
+    parent = os.path.dirname(os.path.abspath(dirpath))
+    os.makedirs(parent, exist_ok=True)
+    tmp = tempfile.mkdtemp(dir=parent, prefix='.tmp-')
+    try:
+        os.chmod(tmp, 0o755)
+        columns = []
+        for i, name in enumerate(df.columns):
+            col = df[name]
+            entry = {'name': str(name), 'file': f'c{i}.npy'}
+            if col.dtype.kind in 'biufcmM' and not isinstance(col.dtype, pd.CategoricalDtype):
+                np.save(os.path.join(tmp, entry['file']), col.to_numpy())
+                entry['kind'] = 'array'
+            else:
+                nulls = col.isna().to_numpy()
+                values = col.astype(object).where(~nulls, '').astype(str).to_numpy(dtype=str)
+                np.save(os.path.join(tmp, entry['file']), values)
+                entry['kind'] = 'string'
+                if nulls.any():
+                    entry['mask'] = f'c{i}.mask.npy'
+                    np.save(os.path.join(tmp, entry['mask']), nulls)
+            columns.append(entry)
+        meta = dict(meta or {}, version=FORMAT_VERSION, rows=len(df), columns=columns)
+        with open(os.path.join(tmp, META_FILE), 'w') as f:
+            json.dump(meta, f)
+        return _publish(tmp, dirpath, overwrite)
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)  # gone already if it was published
+
+
+def _publish(tmp, dirpath, overwrite):
+    """Rename directory `tmp` to `dirpath`; False if a valid entry is already there and is kept."""
+    try:
+        os.replace(tmp, dirpath)
+        return True
+    except OSError:
+        if not os.path.isdir(dirpath):
+            raise
+    if not overwrite and read_meta(dirpath) is not None:
+        return False
+    # Replaced on purpose, or left by an older format: move the old entry aside first
+    trash = tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(dirpath)), prefix='.old-')
+    try:
+        os.replace(dirpath, os.path.join(trash, 'entry'))
+        os.replace(tmp, dirpath)
+    except OSError:
+        # Another process published in between; keep its entry
+        if read_meta(dirpath) is None:
+            raise
+        return False
+    finally:
+        shutil.rmtree(trash, ignore_errors=True)
+    return True
+
+
+@contextlib.contextmanager
+def locked(dirpath):
+    """Hold an exclusive lock on the mutable cache entry `dirpath`, across processes."""
+    os.makedirs(os.path.dirname(os.path.abspath(dirpath)), exist_ok=True)
+    with open(dirpath + '.lock', 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+def read_meta(dirpath):
+    try:
+        with open(os.path.join(dirpath, META_FILE)) as f:
+            meta = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return meta if meta.get('version') == FORMAT_VERSION else None
+
+
+def write_meta(dirpath, meta):
+    """Replace the meta file of a mutable entry; callers hold locked(dirpath)."""
+    tmp = os.path.join(dirpath, META_FILE + '.tmp')
+    with open(tmp, 'w') as f:
+        json.dump(meta, f)
+    os.replace(tmp, os.path.join(dirpath, META_FILE))
+
+
+def load_frame(dirpath, meta=None, mmap=True):
+    """Load a frame written by save_frame, memory-mapping numeric columns.
+
+    Columns are mapped copy-on-write, so scripts may still modify the frame in
+    place without touching the cache. Only the first meta['rows'] values of
+    each column are read, so rows an interrupted append left behind are ignored.
+    """
+    meta = meta or read_meta(dirpath)
+    mode = 'c' if mmap else None
+    rows = meta['rows']
+    data = {}
+    for entry in meta['columns']:
+        # asarray drops the np.memmap subclass but keeps the mapping as the buffer.
+        values = np.asarray(np.load(os.path.join(dirpath, entry['file']), mmap_mode=mode))[:rows]
+        if entry['kind'] == 'string':
+            values = values.astype(object)
+            if 'mask' in entry:
+                values[np.load(os.path.join(dirpath, entry['mask']))[:rows]] = None
+        data[entry['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def load_csv(path, reader=None, cache=True, store=None, **kwargs):
+    """Read a CSV through the content-addressed columnar store.
+
+    `reader` defaults to pd.read_csv and receives `path` plus `kwargs`; tables
+    are keyed on the file content and on both, so different parse options
+    never share an entry. Pass cache=False to bypass the store entirely.
+    """
+    reader = reader or pd.read_csv
+    if not cache:
+        return reader(path, **kwargs)
+    digest = dataset_digest(path, store)
+    dirpath = object_path(digest, reader_key(reader, kwargs), store)
+    meta = read_meta(dirpath)
+    if meta is not None:
+        return load_frame(dirpath, meta)
+
+    df = reader(path, **kwargs)
+    # If another process stored the same content first, its object is kept and loaded
+    save_frame(df, dirpath, {'digest': digest})
+    return load_frame(dirpath)
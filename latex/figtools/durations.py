@@ -0,0 +1,58 @@
+# Parser for columns of Kotlin Duration.toString() output.
+#
+# Kotlin prints durations either with a single unit ("568.630167ms", "12us")
+# or as compound components ("1m 3.2s", "2h 5m"), negated as "-1.5s" or
+# "-(1m 3.2s)", and "Infinity" for the infinite duration.
+
+import re
+
+import numpy as np
+import pandas as pd
+
+UNIT_MS = {
+    'ns': 1e-6,
+    'us': 1e-3,
+    'µs': 1e-3,
+    'ms': 1.0,
+    's': 1e3,
+    'm': 60e3,
+    'h': 3600e3,
+    'd': 86400e3,
+}
+
+NUMBER = r'\d+(?:\.\d+)?(?:[eE][+-]?\d+)?'
+# Longer units first so "ms" is not read as "m" followed by "s".
+UNITS = r'ns|us|µs|ms|s|m|h|d'
+# Bare newlines are matched too: their running count is the row each
+# component belongs to.
+COMPONENT = re.compile(rf'(\n)|({NUMBER})({UNITS})(?![A-Za-z])')
+# A whole entry; anything else left over (e.g. "1.5x3ms") makes the row NaN
+# rather than letting a stray component through.
+DURATION = re.compile(rf'-?(?:Infinity|\(?(?:{NUMBER}(?:{UNITS})\s*)+\)?)')
+
+
+def parse_durations(values):
+    """Float64 milliseconds for a column of Kotlin duration strings.
+
+    The column is joined into one string and every component is extracted in
+    a single regex pass, then summed per row with bincount. Unparseable and
+    missing entries, including ones with text no component accounts for,
+    become NaN.
+    """
+    s = pd.Series(values, dtype=object)
+    text = s.where(s.notna(), '').astype(str).str.strip().to_numpy(dtype=str)
+    n = len(text)
+
+    matches = np.array(COMPONENT.findall('\n'.join(text)), dtype=object).reshape(-1, 3)
+    newline = matches[:, 0] == '\n'
+    row = np.cumsum(newline)[~newline]
+    amount, unit = matches[~newline, 1:].T
+    scale = pd.Series(unit, dtype=object).map(UNIT_MS).to_numpy(dtype=np.float64)
+    ms = amount.astype(str).astype(np.float64) * scale
+
+    total = np.bincount(row, weights=ms, minlength=n)
+    out = np.where(np.bincount(row, minlength=n) > 0, total, np.nan)
+    out[np.char.endswith(text, 'Infinity')] = np.inf
+    out[np.char.startswith(text, '-')] *= -1
+    out[~pd.Series(text).str.fullmatch(DURATION).to_numpy(dtype=bool)] = np.nan
+    return out
@@ -0,0 +1,78 @@
+# Compressed empirical CDFs for heavy-tailed rank distributions.
+#
+# Ranks reach 10^6 but most instances tie at small values, so an ECDF is
+# stored as one step per distinct value (np.unique with counts) instead of
+# one point per instance. For plotting, the steps are thinned to a fixed
+# budget spread evenly in log space; the CDF value at every kept step is
+# exact. Bands come from the Dvoretzky-Kiefer-Wolfowitz inequality, which
+# holds uniformly over the whole curve.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def dkw_epsilon(n, confidence=0.95):
+    """Half-width of the DKW band: P(sup |F_n - F| > eps) <= 1 - confidence."""
+    with np.errstate(divide='ignore'):
+        return np.sqrt(np.log(2 / (1 - confidence)) / (2 * np.asarray(n, dtype=np.float64)))
+
+
+@dataclass
+class StepECDF:
+    """cdf[i] is the fraction of the n values that are <= x[i]."""
+    x: np.ndarray
+    cdf: np.ndarray
+    n: int
+
+    def __call__(self, t):
+        """F_n(t) for each threshold t."""
+        i = np.searchsorted(self.x, np.asarray(t), side='right')
+        return np.concatenate([[0.0], self.cdf])[i]
+
+    def band(self, confidence=0.95):
+        """(lower, upper) DKW bounds at every step."""
+        eps = dkw_epsilon(self.n, confidence)
+        return np.clip(self.cdf - eps, 0, 1), np.clip(self.cdf + eps, 0, 1)
+
+    def downsample(self, budget=200):
+        """StepECDF keeping at most about `budget` steps, evenly spaced in log x.
+
+        The last step in each log-spaced bin is kept, along with every step at
+        x <= 0 (which a log axis cannot place anyway) and the final step.
+        """
+        if len(self.x) <= budget:
+            return self
+        positive = self.x > 0
+        kept = ~positive
+        if positive.any():
+            lx = np.log(self.x[positive])
+            span = lx[-1] - lx[0]
+            bins = np.floor((lx - lx[0]) / span * (budget - 1)) if span > 0 else np.zeros_like(lx)
+            last = np.r_[bins[1:] != bins[:-1], True]
+            kept[np.flatnonzero(positive)[last]] = True
+        kept[-1] = True
+        return StepECDF(self.x[kept], self.cdf[kept], self.n)
+
+
+def ecdf(values):
+    """StepECDF of `values`, ignoring NaNs."""
+    values = np.asarray(values)
+    if values.dtype.kind == 'f':
+        values = values[~np.isnan(values)]
+    x, counts = np.unique(values, return_counts=True)
+    n = int(counts.sum())
+    return StepECDF(x, np.cumsum(counts) / max(n, 1), n)
+
+
+def threshold_table(curves, thresholds, confidence=0.95):
+    """F(t) with DKW bounds for every curve in `curves` (name -> StepECDF) and threshold t."""
+    import pandas as pd  # here, so pgfplots can use ecdf without loading pandas
+
+    rows = []
+    for name, curve in curves.items():
+        eps = dkw_epsilon(curve.n, confidence)
+        for t, p in zip(thresholds, curve(thresholds)):
+            rows.append({'model': name, 'threshold': t, 'n': curve.n, 'cdf': p,
+                         'low': max(p - eps, 0.0), 'high': min(p + eps, 1.0)})
+    return pd.DataFrame(rows)
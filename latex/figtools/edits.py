@@ -0,0 +1,121 @@
+# Struct-of-arrays decoder for the edit fields of the harness result files.
+#
+# Repairs are written by List.summarize() in Levenshtein.kt as a ragged tail of
+# ", "-separated fields after the fixed columns:
+#
+#   I::<token>::<pos>            insertion of <token> at <pos>
+#   D::<token>::<pos>            deletion of <token> at <pos>
+#   S::<old>::<new>::<pos>       substitution of <old> by <new> at <pos>
+#
+# Tokens may themselves be ':' or ',', so fields are matched with one regex
+# scan over the raw text rather than by splitting on separators. The pattern
+# also matches bare newlines, whose running count gives the instance id.
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+OP_INSERT, OP_DELETE, OP_SUBST = 0, 1, 2
+OP_NAMES = np.array(['I', 'D', 'S'])
+
+EDIT_FIELD = re.compile(
+    r'(\n)'
+    r'|(?:^|(?<=, ))(?:([ID])::(.+?)|S::(.+?)::(.+?))::(\d+)(?=, |\r?$)',
+    re.M,
+)
+
+
+@dataclass
+class EditTable:
+    """One row per edit; `tokens` maps token ids back to strings.
+
+    `token` is the inserted, deleted or substituted-in token. `source` is the
+    token being replaced for substitutions and -1 otherwise.
+    """
+    instance: np.ndarray  # int32, row of the source file (0-based, header excluded)
+    op: np.ndarray        # uint8, one of OP_INSERT, OP_DELETE, OP_SUBST
+    token: np.ndarray     # int32 index into tokens
+    source: np.ndarray    # int32 index into tokens, or -1
+    pos: np.ndarray       # int16 token position in the broken snippet
+    tokens: np.ndarray    # token dictionary
+
+    def __len__(self):
+        return len(self.instance)
+
+    def token_id(self, token):
+        """Id of `token`, or -1 if it never occurs."""
+        hits = np.flatnonzero(self.tokens == token)
+        return int(hits[0]) if len(hits) else -1
+
+    def edits_per_instance(self, n_instances=None):
+        return np.bincount(self.instance, minlength=n_instances or 0)
+
+    def frame(self):
+        """The table as a DataFrame with decoded op and token strings."""
+        source = np.where(self.source >= 0, self.tokens[np.maximum(self.source, 0)], None)
+        return pd.DataFrame({
+            'instance': self.instance,
+            'op': OP_NAMES[self.op],
+            'token': self.tokens[self.token],
+            'source': source,
+            'pos': self.pos,
+        })
+
+
+def scan_edits(text):
+    """Raw (instance, op, token, old, pos) columns for every edit field in `text`.
+
+    Instance ids count newlines from the start of `text`.
+    """
+    matches = np.array(EDIT_FIELD.findall(text), dtype=object).reshape(-1, 6)
+    newline = matches[:, 0] == '\n'
+    instance = np.cumsum(newline)[~newline]
+    op, tok, old, new, pos = matches[~newline, 1:].T
+    return instance, op, np.where(op == '', new, tok), old, pos
+
+
+def build_table(instance, op, token, old, pos):
+    is_subst = op == ''
+    op = np.where(is_subst, OP_SUBST, np.where(op == 'D', OP_DELETE, OP_INSERT))
+    # Intern new and old tokens together so both share one dictionary.
+    old = np.where(is_subst, old, None)
+    codes, tokens = pd.factorize(np.concatenate([token, old]), use_na_sentinel=True)
+    n = len(token)
+    return EditTable(
+        instance=instance.astype(np.int32),
+        op=op.astype(np.uint8),
+        token=codes[:n].astype(np.int32),
+        source=codes[n:].astype(np.int32),
+        pos=pos.astype(str).astype(np.int16),
+        tokens=np.asarray(tokens, dtype=object),
+    )
+
+
+def decode_edits(lines):
+    """EditTable for an iterable of raw result lines, one per instance."""
+    return build_table(*scan_edits('\n'.join(lines)))
+
+
+def read_edits(path, chunk_size=64 << 20):
+    """EditTable for every data row of a harness result file.
+
+    The file is scanned in newline-aligned chunks of about `chunk_size` bytes.
+    """
+    parts, offset = [], 0
+    with open(path, newline='') as f:
+        f.readline()
+        while True:
+            text = f.read(chunk_size)
+            if not text:
+                break
+            if not text.endswith('\n'):
+                text += f.readline()
+            instance, *cols = scan_edits(text)
+            parts.append((instance + offset, *cols))
+            offset += text.count('\n')
+    if not parts:
+        empty = np.array([], dtype=object)
+        return build_table(np.array([], dtype=np.int32), empty, empty, empty, empty)
+    return build_table(*(np.concatenate(c) for c in zip(*parts)))
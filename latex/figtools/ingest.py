@@ -0,0 +1,153 @@
+# Append-aware ingest for benchmark logs that grow while experiments run.
+#
+# ingest_csv keeps the same columnar cache as load_csv, but also records the
+# byte offset just past the last complete row it consumed. On the next call
+# only the newly appended complete lines are parsed, and their columns are
+# appended to the cached .npy files in place. The meta file is written last
+# and its row count is authoritative: values past it, left by an append that
+# was interrupted, are ignored on load and overwritten by the next append.
+# If the file was truncated, replaced or rewritten before that offset, the
+# cache is rebuilt from scratch.
+# Unlike the content-addressed store, this cache is updated in place, so
+# every read or update holds its lock.
+
+import hashlib
+import io
+import os
+
+import numpy as np
+import pandas as pd
+
+from figtools.cache import cache_path, load_frame, locked, read_meta, reader_key, save_frame, write_meta
+
+# Bytes hashed at the start of the file and just before the consumed offset
+# to detect rewrites without re-reading everything in between.
+PROBE_SIZE = 4096
+
+
+class StaleCache(Exception):
+    """The cached table cannot be extended and must be rebuilt."""
+
+
+def end_of_last_line(f, size, chunk_size=1 << 16):
+    """Offset just past the last newline in the first `size` bytes of `f`."""
+    pos = size
+    while pos > 0:
+        start = max(0, pos - chunk_size)
+        f.seek(start)
+        i = f.read(pos - start).rfind(b'\n')
+        if i >= 0:
+            return start + i + 1
+        pos = start
+    return 0
+
+
+def probe(f, offset):
+    """Digests of the bytes at the head of the file and just before `offset`."""
+    f.seek(0)
+    head = f.read(min(PROBE_SIZE, offset))
+    start = max(0, offset - PROBE_SIZE)
+    f.seek(start)
+    tail = f.read(offset - start)
+    return [hashlib.blake2b(b, digest_size=16).hexdigest() for b in (head, tail)]
+
+
+def append_npy(path, rows, values):
+    """Write `values` after the first `rows` values of a 1-d .npy file, dropping any beyond them.
+
+    Only the header is rewritten if possible.
+    """
+    with open(path, 'r+b') as f:
+        version = np.lib.format.read_magic(f)
+        read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) else np.lib.format.read_array_header_2_0
+        (stored,), _, dtype = read_header(f)
+        data_start = f.tell()
+        if stored < rows:
+            raise StaleCache(f'{path} holds {stored} rows, expected {rows}')
+
+        if values.dtype.kind == 'U' and values.dtype.itemsize > dtype.itemsize:
+            # Longer strings than the column was sized for: rewrite it wider.
+            widened = np.concatenate([np.load(path, mmap_mode='r')[:rows], values])
+            f.close()
+            np.save(path + '.tmp.npy', widened)
+            os.replace(path + '.tmp.npy', path)
+            return
+        if not np.can_cast(values.dtype, dtype, casting='same_kind'):
+            raise StaleCache(f'Cannot append {values.dtype} to a {dtype} column')
+
+        header = io.BytesIO()
+        write_header = np.lib.format.write_array_header_1_0 if version == (1, 0) else np.lib.format.write_array_header_2_0
+        write_header(header, {'descr': np.lib.format.dtype_to_descr(dtype), 'fortran_order': False, 'shape': (rows + len(values),)})
+        if header.tell() != data_start:
+            raise StaleCache(f'No room to grow the header of {path}')
+        f.seek(data_start + rows * dtype.itemsize)
+        f.write(np.ascontiguousarray(values, dtype=dtype).tobytes())
+        f.truncate()
+        f.seek(0)
+        f.write(header.getvalue())
+
+
+def append_frame(dirpath, meta, df):
+    """Append the rows of `df` to a frame written by save_frame, updating `meta`."""
+    names = [entry['name'] for entry in meta['columns']]
+    if [str(c) for c in df.columns] != names:
+        raise StaleCache(f'Columns changed: {names} -> {list(df.columns)}')
+    old_rows = meta['rows']
+    for entry, name in zip(meta['columns'], df.columns):
+        col = df[name]
+        path = os.path.join(dirpath, entry['file'])
+        if entry['kind'] == 'array':
+            if col.dtype.kind not in 'biufcmM':
+                raise StaleCache(f'Column {name} is no longer numeric')
+            append_npy(path, old_rows, col.to_numpy())
+            continue
+        nulls = col.isna().to_numpy()
+        append_npy(path, old_rows, col.astype(object).where(~nulls, '').astype(str).to_numpy(dtype=str))
+        if 'mask' in entry:
+            append_npy(os.path.join(dirpath, entry['mask']), old_rows, nulls)
+        elif nulls.any():
+            entry['mask'] = entry['file'].replace('.npy', '.mask.npy')
+            np.save(os.path.join(dirpath, entry['mask']), np.concatenate([np.zeros(old_rows, dtype=bool), nulls]))
+    meta['rows'] = old_rows + len(df)
+
+
+def ingest_csv(path, reader=None, **kwargs):
+    """Read a growing CSV, parsing only the complete lines appended since the last call.
+
+    `reader` (default pd.read_csv) must accept a path or a binary buffer that
+    starts with the header line. A trailing partial line is left for later.
+    """
+    reader = reader or pd.read_csv
+    dirpath = cache_path(path, reader_key(reader, kwargs) + '-ingest')
+    with locked(dirpath):
+        meta = read_meta(dirpath)
+
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            stamp = {'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'inode': st.st_ino}
+            if meta is not None and meta['source'] == stamp:
+                return load_frame(dirpath, meta)
+
+            end = end_of_last_line(f, st.st_size)
+            if meta is not None and meta['source']['inode'] == st.st_ino and meta['offset'] <= end \
+                    and probe(f, meta['offset']) == meta['probe']:
+                try:
+                    if end > meta['offset']:
+                        f.seek(0)
+                        header = f.readline()
+                        f.seek(meta['offset'])
+                        chunk = reader(io.BytesIO(header + f.read(end - meta['offset'])), **kwargs)
+                        append_frame(dirpath, meta, chunk)
+                    meta.update(source=stamp, offset=end, probe=probe(f, end))
+                    write_meta(dirpath, meta)
+                    return load_frame(dirpath, meta)
+                except (StaleCache, ValueError, TypeError):
+                    pass  # Fall through to a full rebuild.
+
+            if end == st.st_size:
+                df = reader(path, **kwargs)
+            else:
+                f.seek(0)
+                df = reader(io.BytesIO(f.read(end)), **kwargs)
+            save_frame(df, dirpath, {'source': stamp, 'offset': end, 'probe': probe(f, end)}, overwrite=True)
+        return load_frame(dirpath)
@@ -0,0 +1,176 @@
+# Mergeable log-bucket latency histograms, in the style of HdrHistogram.
+#
+# A value v (in multiples of `unit`) below 2**S, S = sub_bucket_bits, has a
+# bucket of its own. Larger values share a bucket with every value that has
+# the same bit length and the same top S + 1 bits, so each power of two is
+# split into 2**S linear sub-buckets and a bucket never spans more than
+# 2**-S of its values. Counts live in a fixed-size int64 array, so:
+#
+#   * histograms of shards and runs merge by adding arrays,
+#   * a percentile is one cumulative sum over the buckets,
+#   * memory does not grow with the number of values summarized.
+#
+# Values past the top bucket, including infinite durations (timeouts), are
+# counted in the last bucket; NaNs are skipped.
+
+import json
+import os
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+SUB_BUCKET_BITS = 7  # 128 sub-buckets per power of two, < 0.8% relative error
+MAX_BITS = 40        # 2**40 ms is about 35 years
+PERCENTILES = (50, 90, 99, 99.9)
+
+
+def bucket_count(sub_bucket_bits=SUB_BUCKET_BITS, max_bits=MAX_BITS):
+    return (max_bits - sub_bucket_bits + 1) << sub_bucket_bits
+
+
+def bucket_index(values, unit=1.0, sub_bucket_bits=SUB_BUCKET_BITS, max_bits=MAX_BITS):
+    """Bucket of each value; -1 for NaN. Negative values fall in bucket 0."""
+    values = np.asarray(values, dtype=np.float64)
+    n_buckets = bucket_count(sub_bucket_bits, max_bits)
+    with np.errstate(invalid='ignore'):
+        v = np.floor(np.clip(values / unit, 0, float(1 << max_bits)))
+    v = np.where(np.isnan(v), 0, v)
+    _, bits = np.frexp(v)  # bit length of the integer value
+    shift = np.maximum(bits - sub_bucket_bits - 1, 0)
+    idx = (shift.astype(np.int64) << sub_bucket_bits) + (v.astype(np.int64) >> shift)
+    return np.where(np.isnan(values), -1, np.minimum(idx, n_buckets - 1))
+
+
+def bucket_bounds(n_buckets, unit=1.0, sub_bucket_bits=SUB_BUCKET_BITS):
+    """(lowest, highest) integer multiple of `unit` that lands in each bucket."""
+    idx = np.arange(n_buckets, dtype=np.int64)
+    shift = np.maximum((idx >> sub_bucket_bits) - 1, 0)
+    low = (idx - (shift << sub_bucket_bits)) << shift
+    return low * unit, (low + (np.int64(1) << shift) - 1) * unit
+
+
+@dataclass
+class LogHistogram:
+    """counts[..., bucket]; leading axes index independent histograms."""
+    counts: np.ndarray
+    unit: float = 1.0
+    sub_bucket_bits: int = SUB_BUCKET_BITS
+
+    def __add__(self, other):
+        if (self.unit, self.sub_bucket_bits, self.counts.shape[-1]) != \
+                (other.unit, other.sub_bucket_bits, other.counts.shape[-1]):
+            raise ValueError('Cannot merge histograms with different bucket layouts')
+        return LogHistogram(self.counts + other.counts, self.unit, self.sub_bucket_bits)
+
+    @property
+    def total(self):
+        return self.counts.sum(axis=-1)
+
+    def percentiles(self, qs=PERCENTILES):
+        """Highest value in the bucket holding each percentile, shape (..., len(qs)).
+
+        Like HdrHistogram, this reports the top of the bucket, so a percentile
+        is overstated by at most one bucket width. Empty histograms give NaN.
+        """
+        cum = np.cumsum(self.counts, axis=-1)
+        total = cum[..., -1:]
+        rank = np.maximum(np.ceil(np.asarray(qs, dtype=np.float64) / 100 * total), 1)
+        idx = (cum[..., None, :] < rank[..., :, None]).sum(axis=-1)
+        _, high = bucket_bounds(self.counts.shape[-1], self.unit, self.sub_bucket_bits)
+        return np.where(total > 0, high[np.minimum(idx, len(high) - 1)], np.nan)
+
+
+def group_keys(df, by, bin_widths=None):
+    """Key columns for `by`, with columns in `bin_widths` floored to multiples of their width."""
+    keys = pd.DataFrame(index=df.index)
+    for name in by:
+        width = (bin_widths or {}).get(name)
+        keys[name] = df[name] if width is None else df[name] // width * width
+    return keys
+
+
+@dataclass
+class LatencyTable:
+    """One LogHistogram per group key and latency column."""
+    keys: pd.DataFrame
+    histograms: dict
+
+    def merge(self, other):
+        """Union of the groups of both tables, adding the counts of shared groups."""
+        names = list(self.keys.columns)
+        keys = pd.concat([self.keys, other.keys]).drop_duplicates().sort_values(names).reset_index(drop=True)
+        position = pd.MultiIndex.from_frame(keys)
+        histograms = {}
+        for column in dict.fromkeys([*self.histograms, *other.histograms]):
+            merged = None
+            for table in (self, other):
+                if column not in table.histograms:
+                    continue
+                h = table.histograms[column]
+                rows = position.get_indexer(pd.MultiIndex.from_frame(table.keys))
+                counts = np.zeros((len(keys), h.counts.shape[-1]), dtype=np.int64)
+                counts[rows] = h.counts
+                aligned = LogHistogram(counts, h.unit, h.sub_bucket_bits)
+                merged = aligned if merged is None else merged + aligned
+            histograms[column] = merged
+        return LatencyTable(keys, histograms)
+
+    def percentile_table(self, qs=PERCENTILES):
+        """Frame of the group keys plus count and <column>_p<q> for every column and q."""
+        out = self.keys.copy()
+        for column, h in self.histograms.items():
+            out[f'{column}_count'] = h.total
+            for q, values in zip(qs, np.moveaxis(h.percentiles(qs), -1, 0)):
+                out[f'{column}_p{q:g}'] = values
+        return out
+
+    def save(self, path):
+        """Write the table to a .npz file, e.g. to merge the shards of a run later."""
+        arrays = {f'hist_{c}': h.counts for c, h in self.histograms.items()}
+        arrays.update({f'key_{c}': self.keys[c].to_numpy() for c in self.keys.columns})
+        meta = {
+            'keys': list(self.keys.columns),
+            'histograms': {c: [h.unit, h.sub_bucket_bits] for c, h in self.histograms.items()},
+        }
+        np.savez_compressed(path, meta=np.array(json.dumps(meta)), **arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            meta = json.loads(str(f['meta']))
+            keys = pd.DataFrame({c: f[f'key_{c}'] for c in meta['keys']})
+            histograms = {c: LogHistogram(f[f'hist_{c}'], *layout) for c, layout in meta['histograms'].items()}
+        return cls(keys, histograms)
+
+
+def latency_table(df, by=('length', 'lev_dist'), columns=('total_ms', 'sample_ms'), bin_widths=None,
+                  unit=1.0, sub_bucket_bits=SUB_BUCKET_BITS, max_bits=MAX_BITS):
+    """LatencyTable of `columns` for each group of `by`, binning columns listed in `bin_widths`."""
+    by = list(by)
+    keys = group_keys(df, by, bin_widths)
+    codes, uniques = pd.MultiIndex.from_frame(keys).factorize(sort=True)
+    n_buckets = bucket_count(sub_bucket_bits, max_bits)
+    histograms = {}
+    for column in columns:
+        idx = bucket_index(df[column].to_numpy(dtype=np.float64), unit, sub_bucket_bits, max_bits)
+        kept = (idx >= 0) & (codes >= 0)
+        counts = np.bincount(codes[kept] * n_buckets + idx[kept], minlength=len(uniques) * n_buckets)
+        histograms[column] = LogHistogram(counts.reshape(len(uniques), n_buckets), unit, sub_bucket_bits)
+    return LatencyTable(pd.MultiIndex.from_tuples(uniques, names=by).to_frame(index=False), histograms)
+
+
+def read_latency_table(paths, by=('length', 'lev_dist'), columns=('total_ms', 'sample_ms'), bin_widths=None,
+                       chunksize=1 << 20, reader=None, **kwargs):
+    """Merged LatencyTable over CSV shards, read `chunksize` rows at a time.
+
+    `reader` (default pd.read_csv) must accept chunksize and return an
+    iterator of frames. Memory depends on the number of groups, not rows.
+    """
+    reader = reader or pd.read_csv
+    table = None
+    for path in [paths] if isinstance(paths, (str, os.PathLike)) else paths:
+        for chunk in reader(path, chunksize=chunksize, **kwargs):
+            part = latency_table(chunk, by, columns, bin_widths)
+            table = part if table is None else table.merge(part)
+    return table
@@ -0,0 +1,163 @@
+# Streaming parser for the console output of the ProbabilisticLBH benchmarks.
+#
+# testPerfectRecall and testCompleteness only report results as prose, e.g.
+#
+#   Ground truth repair: ...
+#   Found length-2 repair in 1532 ms, 4410 ms, 37 samples
+#   Recall / samples : 12 / 15, errors: 0
+#   Draw timings (ms): {1=311.5, 2=1021.25, 3=0.0}
+#
+# iter_repair_records reads such a capture line by line and yields one
+# RepairRecord per benchmark instance, so arbitrarily large captures are
+# processed in constant memory. read_repair_log collects the records into a
+# DataFrame using the same column names as the harness CSVs, so it can be
+# passed to load_csv as a reader and cached like any other table.
+
+import re
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from figtools.durations import parse_durations
+
+ANSI_ESCAPE = re.compile(r'\x1b\[[0-9;]*m')
+
+BEGIN = re.compile(r'(?:Ground truth repair|Fixing): ')
+FOUND = re.compile(r'Found length-(\d+) repair in (\d+) ms, (\d+) ms, (\d+) samples')
+RECALL = re.compile(r'Recall(?: / samples :|:) (\d+) / (\d+), errors: (\d+)')
+ERROR = re.compile(r'Encountered error: (.*)')
+TIMINGS = re.compile(r'(Draw timings \(ms\)|Full timings \(ms\)|Avg samples drawn): (\{.*\})')
+MISSED = re.compile(r'Drew (\d+) samples in (\S+), length-(\d+) human repair not found')
+INTERSECTED = re.compile(r'Finished intersection in (.+)')
+FOUND_AFTER = re.compile(r'Human repair found after (\d+) samples and (.+)')
+NOT_FOUND = re.compile(r'Human repair not (?:found|recognized by LBH)')
+
+TIMING_KEYS = {
+    'Draw timings (ms)': 'draw_ms',
+    'Full timings (ms)': 'full_ms',
+    'Avg samples drawn': 'avg_samples',
+}
+
+
+@dataclass
+class RepairRecord:
+    """Outcome of one benchmark instance. Missing values are NaN or -1."""
+    instance: int
+    lev_dist: int = -1
+    found: bool = False
+    sample_ms: float = np.nan
+    total_ms: float = np.nan
+    total_samples: int = -1
+    intersect_ms: float = np.nan
+    recall: int = -1
+    total: int = -1
+    errors: int = -1
+    error: str = None
+    # Running per-lev_dist averages printed after each hit, keyed as in TIMING_KEYS.
+    timings: dict = field(default_factory=dict)
+
+
+def kotlin_scalar(text):
+    text = text.strip()
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return {'true': True, 'false': False, 'null': None}.get(text, text)
+
+
+def parse_kotlin_map(text):
+    """Parse Kotlin Map.toString() output such as "{1=0.5, 2=3.0}" into a dict."""
+    text = text.strip()
+    if not (text.startswith('{') and text.endswith('}')):
+        raise ValueError(f'Not a Kotlin map: {text!r}')
+    body = text[1:-1].strip()
+    if not body:
+        return {}
+    pairs = (entry.partition('=') for entry in body.split(', '))
+    return {kotlin_scalar(k): kotlin_scalar(v) for k, _, v in pairs}
+
+
+def iter_repair_records(lines):
+    """Yield a RepairRecord for every instance in an iterable of console lines."""
+    record, next_id = None, 0
+
+    def start():
+        nonlocal next_id
+        next_id += 1
+        return RepairRecord(instance=next_id - 1)
+
+    for line in lines:
+        line = ANSI_ESCAPE.sub('', line).strip()
+        if not line:
+            continue
+        if BEGIN.match(line):
+            if record is not None:
+                yield record
+            record = start()
+        elif m := ERROR.match(line):
+            # Intersection failures are reported before the instance begins.
+            if record is not None:
+                yield record
+            record = start()
+            record.error = m.group(1)
+        elif record is None:
+            continue
+        elif m := FOUND.match(line):
+            record.found = True
+            record.lev_dist = int(m.group(1))
+            record.sample_ms = float(m.group(2))
+            record.total_ms = float(m.group(3))
+            record.total_samples = int(m.group(4))
+        elif m := RECALL.match(line):
+            record.recall, record.total, record.errors = map(int, m.groups())
+        elif m := TIMINGS.match(line):
+            record.timings[TIMING_KEYS[m.group(1)]] = parse_kotlin_map(m.group(2))
+        elif m := MISSED.match(line):
+            record.lev_dist = int(m.group(3))
+            record.total_samples = int(m.group(1))
+        elif m := INTERSECTED.match(line):
+            record.intersect_ms = float(parse_durations([m.group(1)])[0])
+        elif m := FOUND_AFTER.match(line):
+            record.found = True
+            record.total_samples = int(m.group(1)) + 1
+            record.total_ms = float(parse_durations([m.group(2)])[0])
+        elif NOT_FOUND.match(line):
+            record.found = False
+    if record is not None:
+        yield record
+
+
+COLUMN_DTYPES = {
+    'instance': 'int32',
+    'lev_dist': 'int16',
+    'found': 'bool',
+    'sample_ms': 'float64',
+    'total_ms': 'float64',
+    'total_samples': 'int64',
+    'intersect_ms': 'float64',
+    'recall': 'int32',
+    'total': 'int32',
+    'errors': 'int32',
+    'error': 'object',
+}
+
+
+def records_frame(records):
+    """Columnar table of RepairRecords; the per-hit `timings` maps are dropped."""
+    columns = {name: [] for name in COLUMN_DTYPES}
+    for record in records:
+        for name, values in columns.items():
+            values.append(getattr(record, name))
+    return pd.DataFrame({
+        name: np.array(values, dtype=COLUMN_DTYPES[name]) for name, values in columns.items()
+    })
+
+
+def read_repair_log(path):
+    """Read a ProbabilisticLBH console capture into a DataFrame, one row per instance."""
+    with open(path, errors='replace') as f:
+        return records_frame(iter_repair_records(f))
+
@@ -0,0 +1,215 @@
+# Stage-level memoization for the figure scripts.
+#
+# A script's load -> filter -> bin -> aggregate steps can be wrapped in a
+# function decorated with @stage; its DataFrame result is then kept on disk
+# and reused as long as nothing it was computed from changed:
+#
+#   @stage
+#   def aggregate(data, bin_size, iqr_multiplier):
+#       ...
+#       return grouped
+#
+#   grouped = aggregate(load_csv('throughput_log.csv'), 2, 50.5)
+#
+# Entries are keyed on a hash of the stage's source, the figtools sources
+# and every argument (frames and arrays by content), so only the styling
+# after the stage runs again when a colour or label changes. A stage must
+# take everything it depends on as arguments (globals it reads are not part
+# of the key) and must not modify them, since a hit skips its body.
+# Results are stored column by column with cache.save_frame under
+# .figstore/stages/, and the least recently used entries are evicted once
+# the directory outgrows its byte budget.
+
+import functools
+import glob
+import hashlib
+import inspect
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from figtools.cache import META_FILE, STORE_DIR, load_frame, read_meta, save_frame
+
+STAGE_DIR = 'stages'
+# Default size budget of the stage store, overridable per stage.
+BUDGET_BYTES = int(os.environ.get('FIGTOOLS_STAGE_BUDGET', 512 << 20))
+
+
+@functools.lru_cache(maxsize=None)
+def library_digest():
+    """Hash of the figtools sources, so library changes invalidate every stage."""
+    h = hashlib.blake2b(digest_size=16)
+    for path in sorted(glob.glob(os.path.join(os.path.dirname(os.path.abspath(__file__)), '*.py'))):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()
+
+
+def _feed(h, value):
+    """Add `value` to hash `h`: frames, series and arrays by content, containers recursively."""
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        h.update(repr((type(value).__name__, value.shape, list(value.dtypes.items())
+                       if isinstance(value, pd.DataFrame) else value.dtype)).encode())
+        h.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        h.update(repr((value.dtype.str, value.shape)).encode())
+        h.update(np.ascontiguousarray(value).tobytes())
+    elif isinstance(value, (list, tuple)):
+        h.update(f'{type(value).__name__}:{len(value)}'.encode())
+        for item in value:
+            _feed(h, item)
+    elif isinstance(value, dict):
+        h.update(f'dict:{len(value)}'.encode())
+        for key in sorted(value, key=repr):
+            _feed(h, key)
+            _feed(h, value[key])
+    else:
+        h.update(repr(value).encode())
+    h.update(b'\0')
+
+
+def stage_key(fn, args, kwargs):
+    """Hash of the source of `fn`, the figtools sources and the call arguments."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f'{fn.__module__}.{fn.__qualname__}'.encode())
+    try:
+        h.update(inspect.getsource(fn).encode())
+    except (OSError, TypeError):
+        h.update(getattr(fn.__code__, 'co_code', b''))
+    h.update(library_digest().encode())
+    _feed(h, args)
+    _feed(h, kwargs)
+    return h.hexdigest()
+
+
+def entry_size(dirpath):
+    return sum(entry.stat().st_size for entry in os.scandir(dirpath) if entry.is_file())
+
+
+def evict(budget=None, store=None, keep=()):
+    """Remove least recently used stage entries until the store fits `budget` bytes.
+
+    Entries whose directory name is in `keep` are never removed. Returns the
+    removed directories.
+    """
+    budget = BUDGET_BYTES if budget is None else budget
+    root = os.path.join(store or STORE_DIR, STAGE_DIR)
+    try:
+        entries = [entry for entry in os.scandir(root) if entry.is_dir() and not entry.name.startswith('.')]
+    except FileNotFoundError:
+        return []
+    # Hits touch the meta file, so its mtime is the last use
+    used = []
+    for entry in entries:
+        try:
+            used.append((os.stat(os.path.join(entry.path, META_FILE)).st_mtime_ns, entry_size(entry.path), entry))
+        except FileNotFoundError:
+            used.append((0, entry_size(entry.path), entry))
+    total = sum(size for _, size, _ in used)
+    removed = []
+    for _, size, entry in sorted(used, key=lambda u: u[0]):
+        if total <= budget:
+            break
+        if entry.name in keep:
+            continue
+        shutil.rmtree(entry.path, ignore_errors=True)
+        total -= size
+        removed.append(entry.path)
+    return removed
+
+
+def _encode_categoricals(df):
+    """`df` with categorical columns replaced by their codes, plus what restores them.
+
+    Interval categories (from pd.cut) are kept as their bounds. Columns whose
+    categories do not fit in JSON are left to save_frame, which stores them
+    as strings.
+    """
+    out, categoricals = df, {}
+    for name in df.columns:
+        col = df[name]
+        if not isinstance(col.dtype, pd.CategoricalDtype):
+            continue
+        categories = col.cat.categories
+        if isinstance(categories, pd.IntervalIndex):
+            spec = {'left': categories.left.tolist(), 'right': categories.right.tolist(),
+                    'closed': categories.closed}
+        else:
+            spec = {'values': categories.tolist()}
+        try:
+            json.dumps(spec)
+        except TypeError:
+            continue
+        spec['ordered'] = bool(col.cat.ordered)
+        if out is df:
+            out = df.copy()
+        out[name] = col.cat.codes.to_numpy()
+        categoricals[str(name)] = spec
+    return out, categoricals
+
+
+def _load(dirpath, meta):
+    df = load_frame(dirpath, meta)
+    for name, spec in meta.get('categoricals', {}).items():
+        if 'values' in spec:
+            categories = pd.Index(spec['values'])
+        else:
+            categories = pd.IntervalIndex.from_arrays(spec['left'], spec['right'], closed=spec['closed'])
+        df[name] = pd.Categorical.from_codes(df[name].to_numpy(), categories, ordered=spec['ordered'])
+    return df.set_index(meta['index']) if meta['index'] else df
+
+
+def stage(fn=None, *, budget=None, store=None):
+    """Decorator memoizing a function that returns a DataFrame, on disk.
+
+    Use as @stage or @stage(budget=...). A miss returns the stored copy too,
+    so both see the same dtypes: categorical columns, interval bins included,
+    keep their categories, while other object columns come back as strings.
+    The stage should be pure, without side effects or output a hit would
+    skip. The wrapped function gains a `key(*args, **kwargs)` method giving
+    the entry name a call would use.
+    """
+    if fn is None:
+        return functools.partial(stage, budget=budget, store=store)
+
+    def key(*args, **kwargs):
+        return stage_key(fn, args, kwargs)
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        name = key(*args, **kwargs)
+        dirpath = os.path.join(store or STORE_DIR, STAGE_DIR, name)
+        meta = read_meta(dirpath)
+        if meta is not None:
+            try:
+                os.utime(os.path.join(dirpath, META_FILE))
+                return _load(dirpath, meta)
+            except FileNotFoundError:
+                pass  # evicted by another process in the meantime; recompute
+
+        result = fn(*args, **kwargs)
+        if not isinstance(result, pd.DataFrame):
+            raise TypeError(f'stage {fn.__qualname__} must return a DataFrame, got {type(result).__name__}')
+        # save_frame stores columns only; a named or non-default index goes in as columns
+        plain = (isinstance(result.index, pd.RangeIndex) and result.index.start == 0 and result.index.step == 1
+                 and result.index.name is None)
+        index = [] if plain else [level or f'level_{i}' for i, level in enumerate(result.index.names)]
+        table, categoricals = _encode_categoricals(result if plain else result.reset_index(names=index))
+        # If another process stored the same entry first, its copy is kept and loaded
+        save_frame(table, dirpath, {'stage': fn.__qualname__, 'index': index, 'categoricals': categoricals})
+        evict(budget, store, keep={name})
+        # Hand back the stored copy, so a miss and a later hit see the same dtypes,
+        # unless another process evicted it in the meantime
+        meta = read_meta(dirpath)
+        if meta is not None:
+            try:
+                return _load(dirpath, meta)
+            except FileNotFoundError:
+                pass
+        return result
+
+    wrapper.key = key
+    return wrapper
@@ -0,0 +1,54 @@
+# Outcome buckets for the Sankey diagrams of repair results.
+#
+# Every instance either has a rank (the position of the human repair among
+# the suggestions, counted from rank_base) or failed with one of the outcome
+# codes below. Ranks are split into Top-k buckets by one np.digitize over the
+# cut-offs, failures are mapped to their code, and a single bincount gives
+# the flows for matplotlib.sankey.Sankey.
+
+import numpy as np
+import pandas as pd
+
+# No repair generated, human repair not recovered, out of memory, crashed
+OUTCOMES = ['NG', 'NR', 'OOM', 'Error']
+NOT_RECOVERED = 'NR'
+
+
+def rank_labels(ks):
+    """Top-k bucket labels for the cut-offs `ks`, e.g. (1, 10) -> Top-1, Top-[2-10], Top-11+."""
+    labels = [f'Top-{ks[0]}' if ks[0] == 1 else f'Top-[1-{ks[0]}]']
+    labels += [f'Top-[{lo + 1}-{hi}]' for lo, hi in zip(ks[:-1], ks[1:])]
+    return labels + [f'Top-{ks[-1] + 1}+']
+
+
+def outcome_flows(rank, outcome=None, ks=(1, 10, 100), rank_base=0, outcomes=OUTCOMES,
+                  total_label='Total', labels=None, drop_empty=True):
+    """(flows, labels) for Sankey: the total, then minus the count of every bucket.
+
+    Instances with a rank of at least `rank_base` fall in the Top-k bucket of
+    the smallest k in `ks` that holds them. The others are counted under
+    their `outcome` code (one of `outcomes`), or as NR if no code is given.
+    `labels` overrides the len(ks) + 1 Top-k labels; empty failure buckets
+    are dropped unless drop_empty=False.
+    """
+    ks = list(ks)
+    if labels is not None and len(labels) != len(ks) + 1:
+        raise ValueError(f'Expected {len(ks) + 1} labels for cut-offs {ks}, got {len(labels)}')
+    rank = np.asarray(rank, dtype=np.int64) - rank_base
+    found = rank >= 0
+    code = np.digitize(rank, ks)
+
+    failure = np.full(np.count_nonzero(~found), outcomes.index(NOT_RECOVERED))
+    if outcome is not None:
+        # Only the failed instances need their code looked up
+        given = pd.Series(np.asarray(outcome, dtype=object)[~found])
+        given = given.where(given.notna() & (given != ''), NOT_RECOVERED)
+        failure = pd.Categorical(given, categories=outcomes).codes
+        if (failure < 0).any():
+            raise ValueError(f'Unknown outcome codes: {sorted(set(given[failure < 0]))}')
+    code[~found] = len(ks) + 1 + failure
+
+    counts = np.bincount(code, minlength=len(ks) + 1 + len(outcomes))
+    names = list(rank_labels(ks) if labels is None else labels) + list(outcomes)
+    kept = [i for i, c in enumerate(counts) if c or not drop_empty or i <= len(ks)]
+    return [int(len(rank))] + [-int(counts[i]) for i in kept], [total_label] + [names[i] for i in kept]
@@ -0,0 +1,162 @@
+# Parser for the Precision@k blocks printed by the repair benchmarks.
+#
+# Each block holds one line per metric, listing the precision reached within
+# each time budget:
+#
+#   P@1= 90000s: 0.520, 80000s: 0.520, ..., 10000s: 0.316,
+#   P@All= 90000s: 0.989, ...
+#
+# Blocks are labelled by the closest preceding line that matches a label
+# pattern, by default the name of the *_edits_sec / *_edits_ms variable that
+# holds the block in repair_plot.py.
+# Any number of blocks is read from a file or stream in a single pass and
+# packed into a dense (level x metric x budget) float64 cube, which remembers
+# the order the budgets were listed in.
+#
+# patk_from_records builds the same cube from raw per-instance records
+# instead, so P@k can be re-evaluated at any budgets without rerunning.
+
+import re
+from dataclasses import dataclass
+
+import numpy as np
+
+from figtools.precision import first_k_index
+
+PATK_LINE = re.compile(r'\s*P@(\w+)=(.*)')
+PATK_ENTRY = re.compile(r'(\d+)s:\s*(\d+(?:\.\d+)?)')
+LEVEL_LABEL = re.compile(r'^\s*(\w+_edits\w*)\s*=')
+
+METRICS = ['1', '5', '10', 'All']
+
+
+@dataclass
+class PatkCube:
+    """values[level, metric, budget] is P@metric within budget, NaN if not reported."""
+    levels: list
+    metrics: list
+    budgets: np.ndarray  # int64, ascending
+    values: np.ndarray   # float64, shape (levels, metrics, budgets)
+    order: np.ndarray = None  # indices into budgets in the order the source listed them
+
+    @property
+    def listed_budgets(self):
+        """Budgets in the order the source listed them (ascending if it did not say)."""
+        return self.budgets if self.order is None else self.budgets[self.order]
+
+    def level(self, label):
+        return self.values[self.levels.index(label)]
+
+    def level_budgets(self, label):
+        """Listed budgets with at least one value at level `label`, in listed order."""
+        order = np.arange(len(self.budgets)) if self.order is None else self.order
+        reported = ~np.isnan(self.level(label)).all(axis=0)
+        return self.budgets[order[reported[order]]]
+
+    def plot_data(self, label):
+        """The [(P@k, {budget: value})] list that repair_plot.plot_data expects, in listed budget order."""
+        order = np.arange(len(self.budgets)) if self.order is None else self.order
+        rows = []
+        for metric, row in zip(self.metrics, self.level(label)):
+            scores = {str(self.budgets[j]): float(row[j]) for j in order if not np.isnan(row[j])}
+            if scores:
+                rows.append((f'P@{metric}', scores))
+        return rows
+
+
+def iter_patk_blocks(lines, label=LEVEL_LABEL):
+    """Yield (label, {metric: {budget: value}}) for every P@k block in `lines`.
+
+    A block ends at the next label line or when one of its metrics repeats.
+    Blocks with no preceding label are numbered by position.
+    """
+    current, block, count = None, {}, 0
+
+    def flush():
+        nonlocal block, count
+        name = current if current is not None else str(count)
+        done, block, count = (name, block), {}, count + 1
+        return done
+
+    for line in lines:
+        if m := PATK_LINE.match(line):
+            metric = m.group(1)
+            if metric in block:
+                yield flush()
+            block[metric] = {int(b): float(v) for b, v in PATK_ENTRY.findall(m.group(2))}
+        elif m := label.search(line):
+            if block:
+                yield flush()
+            current = m.group(1)
+    if block:
+        yield flush()
+
+
+def parse_patk(source, label=LEVEL_LABEL):
+    """PatkCube for every block in `source`, a string, open file or iterable of lines."""
+    if isinstance(source, str):
+        source = source.splitlines()
+    blocks = list(iter_patk_blocks(source, label))
+
+    levels = [name for name, _ in blocks]
+    seen = {metric for _, block in blocks for metric in block}
+    metrics = [m for m in METRICS if m in seen]
+    metrics += sorted(seen.difference(METRICS), key=lambda m: (not m.isdigit(), int(m) if m.isdigit() else 0, m))
+    listed = list(dict.fromkeys(b for _, block in blocks for row in block.values() for b in row))
+    budgets = np.array(sorted(listed), dtype=np.int64)
+
+    values = np.full((len(levels), len(metrics), len(budgets)), np.nan)
+    metric_index = {m: i for i, m in enumerate(metrics)}
+    for i, (_, block) in enumerate(blocks):
+        for metric, row in block.items():
+            if row:
+                cols = np.searchsorted(budgets, list(row))
+                values[i, metric_index[metric], cols] = list(row.values())
+    return PatkCube(levels, metrics, budgets, values, np.searchsorted(budgets, listed))
+
+
+def patk_from_records(time_ms, rank, lev_dist, budgets, ks=(1, 5, 10), rank_base=0, label='lev_{}_edits_sec'):
+    """PatkCube of P@k within each budget (ms) for every Δ level, from raw instances.
+
+    An instance counts for P@k within b when its human repair was ranked in
+    the top k and found after at most b ms; P@All drops the rank condition.
+    Ranks below `rank_base` and NaN or infinite times mean it was not found.
+    Levels are named label.format(d), plus label.format('all') for all
+    instances pooled, so the result plugs into plot_data like a parsed block;
+    budgets keep the order they were given in.
+
+    The instances are sorted once by (level, top-k slot, time); each count is
+    then a binary search into its slot, so the cost is O(n log n) for the
+    sort plus O(log n) per (level, k, budget) cell.
+    """
+    time_ms = np.asarray(time_ms, dtype=np.float64)
+    rank = np.asarray(rank)
+    listed = list(dict.fromkeys(np.asarray(budgets, dtype=np.int64).tolist()))
+    budgets = np.unique(listed).astype(np.int64)
+    ks = np.unique(np.asarray(ks, dtype=np.int64))
+    levels, level = np.unique(np.asarray(lev_dist), return_inverse=True)
+
+    # Slot j < len(ks) is the smallest top-k holding the rank, len(ks) is
+    # found outside every top-k; instances that were not found are dropped.
+    slot = first_k_index(rank, ks, rank_base)
+    found = (np.asarray(rank) >= rank_base) & np.isfinite(time_ms)
+    n_slots = len(ks) + 1
+    key = level[found] * n_slots + slot[found]
+    order = np.lexsort((time_ms[found], key))
+    key, times = key[order], time_ms[found][order]
+
+    starts = np.searchsorted(key, np.arange(len(levels) * n_slots + 1))
+    within = np.empty((len(levels) * n_slots, len(budgets)), dtype=np.int64)
+    for c in range(len(levels) * n_slots):
+        within[c] = np.searchsorted(times[starts[c]:starts[c + 1]], budgets, side='right')
+    within = np.cumsum(within.reshape(len(levels), n_slots, len(budgets)), axis=1)
+
+    totals = np.bincount(level, minlength=len(levels))
+    within = np.concatenate([within, within.sum(axis=0, keepdims=True)])
+    totals = np.append(totals, totals.sum())
+    with np.errstate(invalid='ignore', divide='ignore'):
+        values = within / totals[:, None, None]
+
+    names = [label.format(d) for d in levels] + [label.format('all')]
+    metrics = [str(k) for k in ks] + ['All']
+    return PatkCube(names, metrics, budgets, values, np.searchsorted(budgets, listed))
@@ -0,0 +1,190 @@
+# Direct pgfplots output from NumPy arrays, without matplotlib.
+#
+# An Axis collects series and writes a tikzpicture whose \addplot commands
+# reference one external whitespace-separated .dat table per series:
+#
+#   ax = Axis('timings.tex', xlabel='$n$', ylabel='ms', ymode='log')
+#   ax.scatter(n, ms, label='$k=1$')
+#   ax.write()
+#
+# writes timings.tex plus timings-0.dat. Files whose content would not
+# change are left untouched, so their mtimes (and anything that rebuilds on
+# them, like latexmk) only move when the data does.
+#
+# Dense layers can instead be handed over as a pre-rendered PNG (Axis.image),
+# placed with \addplot graphics under the vector axes, so the cost of
+# compiling and viewing the figure no longer depends on the number of points.
+
+import io
+import os
+
+import numpy as np
+
+from figtools.ecdf import ecdf
+
+MARKS = ['*', 'square*', 'triangle*', 'diamond*', 'o', 'x']
+
+
+def option_list(options):
+    """pgfplots keys from a dict (True means a bare key) or an iterable of strings."""
+    if not isinstance(options, dict):
+        return list(options)
+    return [key if value is True else f'{key}={{{value}}}' if any(c in str(value) for c in ',=') else f'{key}={value}'
+            for key, value in options.items() if value is not None and value is not False]
+
+
+def format_options(options):
+    return ', '.join(option_list(options))
+
+
+def format_table(columns):
+    """Text of a pgfplots table with a header row, one column per (name, array) pair."""
+    names = list(columns)
+    data = np.column_stack([np.asarray(columns[name], dtype=np.float64) for name in names])
+    buffer = io.StringIO()
+    np.savetxt(buffer, data, fmt='%.9g', header=' '.join(names), comments='')
+    return buffer.getvalue()
+
+
+def write_if_changed(path, text):
+    """Write `text` (str or bytes) to `path` unless it already holds exactly that; True if written."""
+    data = text.encode() if isinstance(text, str) else text
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except FileNotFoundError:
+        pass
+    tmp = path + '.tmp'
+    with open(tmp, 'wb') as f:
+        f.write(data)
+    os.replace(tmp, path)
+    return True
+
+
+class Axis:
+    """One pgfplots axis, written to `path` with its series tables alongside.
+
+    Keyword arguments become axis options, with underscores read as spaces
+    (legend_pos='north west'). Tables are named <path stem>-<i>.dat and
+    referenced relative to the directory of `path`, which is where LaTeX
+    runs for the figures in this repo. Lines in `extra` are emitted after
+    the plots, e.g. for threshold markers. Raster layers from image() are
+    written as <path stem>-<i>.png and drawn first, below everything else.
+    """
+
+    def __init__(self, path, environment='axis', **options):
+        self.path = path
+        self.environment = environment
+        self.options = {key.replace('_', ' '): value for key, value in options.items()}
+        self.plots = []    # (options, table columns, table options, legend entry)
+        self.extra = []    # raw lines placed after the plots
+        self.images = []   # (PNG bytes, graphics options)
+        self.legend_images = []  # (plot options, legend entry) for series drawn into an image
+
+    def add(self, columns, plot_options=(), table_options=None, label=None):
+        """Add a plot of the table `columns` (name -> array); returns self."""
+        self.plots.append((plot_options, columns, table_options or {}, label))
+        return self
+
+    def _mark(self):
+        return MARKS[len(self.plots) % len(MARKS)]
+
+    def scatter(self, x, y, label=None, mark=None, mark_size='1.5pt', **options):
+        opts = {'only marks': True, 'mark': mark or self._mark(), 'mark size': mark_size, **options}
+        return self.add({'x': x, 'y': y}, opts, label=label)
+
+    def line(self, x, y, label=None, **options):
+        return self.add({'x': x, 'y': y}, {'no markers': True, **options}, label=label)
+
+    def errorbar(self, x, y, low, high, label=None, **options):
+        """Points at (x, y) with asymmetric bars down to `low` and up to `high`."""
+        y = np.asarray(y, dtype=np.float64)
+        columns = {'x': x, 'y': y, 'minus': y - np.asarray(low), 'plus': np.asarray(high) - y}
+        # Keys after error bars/.cd belong to the error bars, so they go last
+        opts = {**options, 'error bars/.cd': True, 'y dir': 'both', 'y explicit': True}
+        return self.add(columns, opts, {'y error plus': 'plus', 'y error minus': 'minus'}, label)
+
+    def bars(self, groups, labels=None, **options):
+        """Grouped bars: `groups` maps a legend entry to one value per category.
+
+        Categories are placed at x = 0, 1, ...; `labels` names them on the axis.
+        """
+        groups = {name: np.asarray(values, dtype=np.float64) for name, values in groups.items()}
+        n = max((len(v) for v in groups.values()), default=0)
+        self.options.setdefault('ybar', True)
+        self.options.setdefault('xtick', ','.join(str(i) for i in range(n)))
+        if labels is not None:
+            self.options.setdefault('xticklabels', ','.join(f'{{{label}}}' for label in labels))
+        for name, values in groups.items():
+            self.add({'x': np.arange(len(values)), 'y': values}, {'fill': True, **options}, label=name)
+        return self
+
+    def cdf(self, values, label=None, budget=200, **options):
+        """Empirical CDF of `values` as a step plot, thinned to about `budget` steps in log x."""
+        curve = ecdf(values).downsample(budget)
+        return self.add({'x': curve.x, 'y': curve.cdf}, {'const plot': True, 'no markers': True, **options},
+                        label=label)
+
+    def image(self, png, xmin, xmax, ymin, ymax, legend=()):
+        """Add a raster layer: `png` (bytes) stretched over the given data limits.
+
+        The axis limits are pinned to the image so the two line up. `legend`
+        holds (plot options, label) pairs for the series drawn into the image,
+        shown with \addlegendimage since the image itself has no entries.
+        """
+        limits = {key: f'{float(value):.9g}' for key, value in
+                  {'xmin': xmin, 'xmax': xmax, 'ymin': ymin, 'ymax': ymax}.items()}
+        self.images.append((png, limits))
+        self.options.update(limits)
+        self.options.setdefault('axis on top', True)
+        self.legend_images += [(options, label) for options, label in legend]
+        return self
+
+    def table_path(self, i):
+        return f'{os.path.splitext(self.path)[0]}-{i}.dat'
+
+    def image_path(self, i):
+        return f'{os.path.splitext(self.path)[0]}-{i}.png'
+
+    def render(self):
+        """Text of the .tex file."""
+        lines = [r'\begin{tikzpicture}', rf'\begin{{{self.environment}}}[']
+        lines += [f'  {option},' for option in option_list(self.options)]
+        lines.append(']')
+        folder = os.path.dirname(self.path)
+        for i, (_, limits) in enumerate(self.images):
+            image = os.path.relpath(self.image_path(i), folder or '.')
+            lines.append(rf'\addplot[forget plot] graphics[{format_options(limits)}] {{{image}}};')
+        for options, _ in self.legend_images:
+            lines.append(rf'\addlegendimage{{{format_options(options)}}}')
+        legend = [label for _, label in self.legend_images]
+        legend += [label for *_, label in self.plots if label is not None]
+        for i, (plot_options, _, table_options, label) in enumerate(self.plots):
+            options = option_list(plot_options)
+            if legend and label is None:
+                # Unlabelled plots must not take a legend entry from the next one. The key
+                # goes before any .../.cd, after which keys resolve under that path
+                cd = next((j for j, option in enumerate(options) if option.endswith('/.cd')), len(options))
+                options.insert(cd, 'forget plot')
+            table = format_options({'x': 'x', 'y': 'y', **table_options})
+            data = os.path.relpath(self.table_path(i), folder or '.')
+            lines.append(rf'\addplot+[{", ".join(options)}] table[{table}] {{{data}}};')
+        lines += self.extra
+        if legend:
+            lines.append(r'\legend{' + ', '.join(f'{{{label}}}' for label in legend) + '}')
+        lines += [rf'\end{{{self.environment}}}', r'\end{tikzpicture}']
+        return '\n'.join(lines) + '\n'
+
+    def write(self):
+        """Write the .tex file, every series table and image; returns the paths actually rewritten."""
+        written = []
+        for i, (png, _) in enumerate(self.images):
+            if write_if_changed(self.image_path(i), png):
+                written.append(self.image_path(i))
+        for i, (_, columns, _, _) in enumerate(self.plots):
+            if write_if_changed(self.table_path(i), format_table(columns)):
+                written.append(self.table_path(i))
+        if write_if_changed(self.path, self.render()):
+            written.append(self.path)
+        return written
@@ -0,0 +1,123 @@
+# Precision engines computed directly from raw per-instance records.
+#
+# Every routine here takes flat NumPy columns (one entry per repair instance)
+# and reduces them with a single bincount over a combined group index, so the
+# cost is linear in the number of instances regardless of how many groups the
+# figure needs.
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def first_k_index(rank, ks, rank_base=0):
+    """Index of the smallest k in `ks` whose top-k contains each rank.
+
+    Ranks below `rank_base` (e.g. -1 for "not found") map to len(ks).
+    """
+    ks = np.asarray(ks)
+    rank = np.asarray(rank, dtype=np.int64) - rank_base
+    idx = np.searchsorted(ks, rank + 1, side='left')
+    return np.where(rank < 0, len(ks), idx)
+
+
+@dataclass
+class LengthPrecision:
+    """Top-k/total per (Δ level, |σ| bucket), for several k at once."""
+    levels: np.ndarray  # distinct lev_dist values
+    edges: np.ndarray   # bucket lower bounds; bucket i is [edges[i], edges[i] + width)
+    width: int
+    ks: np.ndarray
+    hits: np.ndarray    # int64, shape (ks, levels, buckets)
+    totals: np.ndarray  # int64, shape (levels, buckets)
+
+    @property
+    def precision(self):
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.hits / self.totals
+
+    def series(self, level, k=1):
+        """(bucket lower bounds, precision) for one Δ level and k, skipping empty buckets."""
+        i, j = np.searchsorted(self.levels, level), np.searchsorted(self.ks, k)
+        kept = self.totals[i] > 0
+        return self.edges[kept], self.precision[j, i, kept]
+
+
+def topk_by_length(length, lev_dist, rank, width=10, ks=(1,), rank_base=0, max_length=None):
+    """Top-k precision for |σ| buckets of `width` tokens and every Δ level.
+
+    `rank` is the position of the human repair among the suggestions, counted
+    from `rank_base`; anything below it means the repair was not found.
+    Instances at or beyond `max_length` are dropped.
+    """
+    length = np.asarray(length, dtype=np.int64)
+    lev_dist = np.asarray(lev_dist)
+    rank = np.asarray(rank)
+    ks = np.unique(np.asarray(ks, dtype=np.int64))
+    if max_length is not None:
+        kept = length < max_length
+        length, lev_dist, rank = length[kept], lev_dist[kept], rank[kept]
+
+    levels, level = np.unique(lev_dist, return_inverse=True)
+    first = (length.min() // width) if len(length) else 0
+    bucket = length // width - first
+    n_buckets = int(bucket.max()) + 1 if len(bucket) else 0
+    n_k = len(ks) + 1  # the last slot collects instances outside every top-k
+
+    group = (level * n_buckets + bucket) * n_k + first_k_index(rank, ks, rank_base)
+    counts = np.bincount(group, minlength=len(levels) * n_buckets * n_k)
+    counts = counts.reshape(len(levels), n_buckets, n_k)
+
+    return LengthPrecision(
+        levels=levels,
+        edges=(np.arange(n_buckets) + first) * width,
+        width=width,
+        ks=ks,
+        hits=np.moveaxis(np.cumsum(counts, axis=-1)[..., :-1], -1, 0),
+        totals=counts.sum(axis=-1),
+    )
+
+
+@dataclass
+class SampleEfficiency:
+    """Cumulative fraction of instances per Δ level repaired within each sample budget."""
+    levels: np.ndarray  # distinct lev_dist values
+    edges: np.ndarray   # sample budgets, ascending; bin i holds (edges[i - 1], edges[i]]
+    counts: np.ndarray  # int64, shape (levels, bins)
+    totals: np.ndarray  # int64, shape (levels,)
+
+    @property
+    def precision(self):
+        """(levels, bins) fraction of each level's instances needing <= edges[i] samples."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.cumsum(self.counts, axis=1) / self.totals[:, None]
+
+    def series(self, level):
+        """(sample budgets, precision) for one Δ level."""
+        return self.edges, self.precision[np.searchsorted(self.levels, level)]
+
+
+def log_edges(max_value, bins_per_decade=10):
+    """Sample budgets 1, 10**(1/b), ..., up to the first one >= max_value, rounded up to integers."""
+    decades = np.log10(max(max_value, 1))
+    edges = np.ceil(10 ** (np.arange(int(np.ceil(decades * bins_per_decade)) + 1) / bins_per_decade))
+    return np.unique(edges.astype(np.int64))
+
+
+def sample_efficiency(samples, lev_dist, bins_per_decade=10, edges=None):
+    """Cumulative precision by samples drawn, for log-spaced budgets and every Δ level.
+
+    All levels are counted in one bincount over (level, bin) and accumulated
+    along the bin axis, so the cost is linear in the number of instances and
+    the result has a few dozen bins per level however large the counts get.
+    Counts above the last of the given `edges` fall in the last bin.
+    """
+    samples = np.asarray(samples)
+    levels, level = np.unique(np.asarray(lev_dist), return_inverse=True)
+    if edges is None:
+        edges = log_edges(samples.max() if len(samples) else 1, bins_per_decade)
+    edges = np.asarray(edges)
+    bucket = np.minimum(np.searchsorted(edges, samples, side='left'), len(edges) - 1)
+    counts = np.bincount(level * len(edges) + bucket, minlength=len(levels) * len(edges))
+    counts = counts.reshape(len(levels), len(edges))
+    return SampleEfficiency(levels, edges, counts, counts.sum(axis=1))
@@ -0,0 +1,49 @@
+# Binary storage for per-instance rank arrays, one .npy file per model.
+#
+# A rank store is a directory of <model>.npy files holding int32 ranks (the
+# position of the human repair among the model's suggestions, -1 if absent).
+# Arrays are memory-mapped on load, so opening dozens of million-instance
+# models costs only a few syscalls each.
+
+import os
+
+import numpy as np
+
+RANK_DTYPE = np.int32
+RANK_SUFFIX = '.npy'
+
+
+def rank_path(name, root='ranks'):
+    return os.path.join(root, name + RANK_SUFFIX)
+
+
+def save_ranks(name, ranks, root='ranks'):
+    """Store the ranks of model `name`, replacing any previous array."""
+    ranks = np.asarray(ranks)
+    if ranks.ndim != 1:
+        raise ValueError(f'Ranks for {name} must be one-dimensional, got shape {ranks.shape}')
+    info = np.iinfo(RANK_DTYPE)
+    if len(ranks) and (ranks.min() < info.min or ranks.max() > info.max):
+        raise ValueError(f'Ranks for {name} do not fit in {np.dtype(RANK_DTYPE).name}')
+    os.makedirs(root, exist_ok=True)
+    tmp = rank_path(name, root) + '.tmp'
+    with open(tmp, 'wb') as f:
+        np.save(f, ranks.astype(RANK_DTYPE))
+    os.replace(tmp, rank_path(name, root))
+
+
+def load_ranks(name, root='ranks', mmap=True):
+    """Ranks of model `name`, memory-mapped read-only unless mmap=False."""
+    return np.load(rank_path(name, root), mmap_mode='r' if mmap else None)
+
+
+def list_models(root='ranks'):
+    """Names of all models in the store, sorted."""
+    if not os.path.isdir(root):
+        return []
+    return sorted(f[:-len(RANK_SUFFIX)] for f in os.listdir(root) if f.endswith(RANK_SUFFIX))
+
+
+def load_models(names=None, root='ranks', mmap=True):
+    """Dict of model name to ranks for `names`, or for every model in the store."""
+    return {name: load_ranks(name, root, mmap) for name in (names or list_models(root))}
@@ -0,0 +1,96 @@
+# Readers for the CSV dialect written by the Kotlin repair harness.
+#
+# The harness joins fields with ", " and appends a variable number of edit
+# fields (edit1, edit2, ...) after the fixed numeric columns. Reading these
+# with sep=r'\s*,\s*' forces pandas onto its slow Python engine, so instead we
+# use the C parser with skipinitialspace and only ask it for the fixed prefix.
+
+import re
+
+import numpy as np
+import pandas as pd
+
+from figtools.durations import parse_durations
+
+# Column types for the fields the harness is known to emit. Anything not
+# listed here is left to pandas' inference. Integer columns are parsed as
+# int64 first and only narrowed to these types when every value fits.
+HARNESS_DTYPES = {
+    'lev': 'int16',
+    'lev_dist': 'int16',
+    'lev_margin': 'int16',
+    'length': 'int32',
+    'productions': 'int32',
+    'lev_ball_arcs': 'int32',
+    'lev_states': 'int32',
+    'samples': 'int64',
+    'total_samples': 'int64',
+    'milliseconds': 'int64',
+    'sample_ms': 'int64',
+    'total_ms': 'int64',
+    'lang_size': 'int64',
+    'rank': 'int64',
+}
+
+# Columns holding Kotlin Duration.toString() output, converted to float ms.
+DURATION_COLUMNS = {'time'}
+
+EDIT_COLUMN = re.compile(r'edit\d+$')
+
+
+def read_header(path):
+    """Column names from the first line of `path` (or a seekable buffer), stripped of padding."""
+    if hasattr(path, 'readline'):
+        start = path.tell()
+        line = path.readline()
+        path.seek(start)
+        line = line.decode() if isinstance(line, bytes) else line
+    else:
+        with open(path, newline='') as f:
+            line = f.readline()
+    return [name.strip() for name in line.rstrip('\r\n').split(',')]
+
+
+def fixed_columns(names):
+    """The leading columns that precede the variable-arity edit fields."""
+    for i, name in enumerate(names):
+        if EDIT_COLUMN.match(name):
+            return names[:i]
+    return names
+
+
+def read_harness_csv(path, dtype=None, **kwargs):
+    """Read a harness CSV with the C parser, dropping any trailing edit fields.
+
+    `dtype` entries override HARNESS_DTYPES; map a column to None to let pandas
+    infer it. Integer columns keep int64 when a value does not fit the listed
+    type, and become float64 (NaN) when a field is empty. Columns in
+    DURATION_COLUMNS are returned as float milliseconds. Extra keyword
+    arguments go to pd.read_csv.
+    """
+    names = fixed_columns(read_header(path))
+    types = {**HARNESS_DTYPES, **(dtype or {})}
+    types = {k: v for k, v in types.items() if k in names and v is not None}
+    # The C parser wraps values that overflow a narrow integer type and
+    # rejects empty fields, so integers are read nullable and narrowed after
+    narrow = {k: t for k, t in ((k, pd.api.types.pandas_dtype(v)) for k, v in types.items())
+              if isinstance(t, np.dtype) and t.kind in 'iu'}
+    df = pd.read_csv(
+        path, engine='c', header=0, names=names, usecols=range(len(names)),
+        skipinitialspace=True, dtype={**types, **{k: 'Int64' for k in narrow}}, **kwargs,
+    )
+    for name, target in narrow.items():
+        df[name] = _narrow(df[name], target)
+    for name in DURATION_COLUMNS.intersection(df.columns):
+        df[name] = parse_durations(df[name])
+    return df
+
+
+def _narrow(col, target):
+    """Nullable integer `col` as `target` if every value fits, else int64, or float64 if any is missing."""
+    if col.hasnans:
+        return col.astype('float64')
+    info = np.iinfo(target)
+    if len(col) and (col.min() < info.min or col.max() > info.max):
+        return col.astype('int64')
+    return col.astype(target)
@@ -0,0 +1,137 @@
+# Scaling-law fits of repair latency against snippet length, per Δ level.
+#
+# Both models are straight lines in log space:
+#
+#   power:        log y = log a + b log x    (y = a x^b)
+#   exponential:  log y = log a + b x        (y = a e^(b x))
+#
+# so every level is fitted at once from weighted sums taken with one
+# np.add.reduceat over the rows sorted by level. Robust fits reweight the
+# rows with Huber weights (iteratively reweighted least squares), which
+# keeps a few timeouts from dragging the exponent. Confidence intervals
+# come from the percentile bootstrap in figtools.bootstrap, refitting every
+# resample of every level together as one (batch, n) matrix.
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from figtools.bootstrap import BATCH_ENTRIES, percentile_band, run_resamples
+
+MODELS = {'power': np.log, 'exp': lambda x: x}
+HUBER_K = 1.345
+ROBUST_ITERATIONS = 10
+MAD_SCALE = 1.4826  # MAD of a standard normal is 1 / 1.4826
+
+
+def _line(f, z, w, starts):
+    """Weighted least-squares (intercept, slope) of z on f for each segment along the last axis."""
+    def total(a):
+        return np.add.reduceat(a, starts, axis=-1)
+    sw, sf, sz = total(w), total(w * f), total(w * z)
+    sff, sfz = total(w * f * f), total(w * f * z)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        slope = (sw * sfz - sf * sz) / (sw * sff - sf * sf)
+        intercept = (sz - slope * sf) / sw
+    return intercept, slope
+
+
+def _huber(resid, scale):
+    with np.errstate(invalid='ignore', divide='ignore'):
+        u = np.abs(resid) / (HUBER_K * scale)
+    return np.where(u > 1, 1 / u, 1.0)
+
+
+def _fit(f, z, starts, counts, robust, scale=None):
+    """(intercept, slope, scale) per segment; a fixed `scale` skips the MAD step."""
+    intercept, slope = _line(f, z, np.ones_like(z), starts)
+    segment = np.repeat(np.arange(len(counts)), counts)
+    for _ in range(ROBUST_ITERATIONS if robust else 0):
+        resid = z - np.repeat(intercept, counts, axis=-1) - np.repeat(slope, counts, axis=-1) * f
+        if scale is None:
+            mad = pd.Series(np.abs(resid)).groupby(segment).median().to_numpy()
+            row_scale = np.repeat(MAD_SCALE * mad, counts)
+        else:
+            row_scale = np.repeat(scale, counts)
+        intercept, slope = _line(f, z, _huber(resid, row_scale), starts)
+    if scale is None:
+        resid = z - np.repeat(intercept, counts) - np.repeat(slope, counts) * f
+        scale = MAD_SCALE * pd.Series(np.abs(resid)).groupby(segment).median().to_numpy()
+    return intercept, slope, scale
+
+
+def _bootstrap_task(shared, rng, size):
+    f, z, starts, counts, robust, scale = shared
+    column_start = np.repeat(starts, counts)
+    column_count = np.repeat(counts, counts)
+    batch = max(1, BATCH_ENTRIES // max(len(z), 1))
+    out = np.empty((size, 2, len(counts)))
+    for i in range(0, size, batch):
+        b = min(batch, size - i)
+        idx = column_start + rng.integers(0, column_count, size=(b, len(z)))
+        intercept, slope, _ = _fit(f[idx], z[idx], starts, counts, robust, scale)
+        out[i:i + b, 0], out[i:i + b, 1] = intercept, slope
+    return out
+
+
+@dataclass
+class ScalingFit:
+    """y = exp(intercept) * x^slope (power) or exp(intercept + slope * x) (exp), per Δ level."""
+    model: str
+    levels: np.ndarray
+    count: np.ndarray
+    intercept: np.ndarray
+    slope: np.ndarray
+    scale: np.ndarray       # robust residual scale in log space
+    slope_low: np.ndarray   # bootstrap interval of the slope, NaN without resamples
+    slope_high: np.ndarray
+
+    def predict(self, level, x):
+        """Fitted latency of `level` at lengths `x`.
+
+        Fits are in log space, so this is the typical (geometric-mean) latency
+        rather than the arithmetic mean, which the slow tail pulls higher.
+        """
+        i = np.searchsorted(self.levels, level)
+        return np.exp(self.intercept[i] + self.slope[i] * MODELS[self.model](np.asarray(x, dtype=np.float64)))
+
+    def table(self):
+        return pd.DataFrame({
+            'lev_dist': self.levels,
+            'count': self.count,
+            'a': np.exp(self.intercept),
+            'b': self.slope,
+            'b_low': self.slope_low,
+            'b_high': self.slope_high,
+            'log_scale': self.scale,
+        })
+
+
+def fit_scaling(x, y, lev_dist, model='power', robust=True, n_resamples=1000, confidence=0.95,
+                seed=0, workers=None):
+    """ScalingFit of latency `y` against length `x` for every Δ level.
+
+    Rows with non-positive or non-finite latency (or length, for the power
+    model) are dropped before taking logs. n_resamples=0 skips the bootstrap.
+    """
+    transform = MODELS[model]
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    lev_dist = np.asarray(lev_dist)
+    kept = np.isfinite(y) & (y > 0) & np.isfinite(x) & ((x > 0) if model == 'power' else True)
+
+    levels, level = np.unique(lev_dist[kept], return_inverse=True)
+    order = np.argsort(level, kind='stable')
+    f, z = transform(x[kept][order]), np.log(y[kept][order])
+    _, starts, counts = np.unique(level[order], return_index=True, return_counts=True)
+
+    intercept, slope, scale = _fit(f, z, starts, counts, robust)
+    if n_resamples:
+        # Resamples reuse the full-data residual scale for their Huber weights
+        shared = (f, z, starts, counts, robust, scale)
+        replicates = run_resamples(_bootstrap_task, shared, n_resamples, seed, workers)
+        low, high = percentile_band(replicates[:, 1], confidence)
+    else:
+        low = high = np.full(len(levels), np.nan)
+    return ScalingFit(model, levels, counts, intercept, slope, scale, low, high)
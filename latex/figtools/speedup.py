@@ -0,0 +1,106 @@
+# Parallel-efficiency analysis of multi-core synthesis runs.
+#
+# Each run record holds the core count, the number of holes, the distinct
+# solutions found and the wall time. Throughput (solutions per second) is
+# pooled over the runs of each (holes, cores) cell with one bincount, and
+# speedup is measured against the single-core cell of the same hole count.
+# Amdahl's and Gustafson's laws are both linear in a transformed speedup,
+# so their serial fractions are fitted for every hole count at once by
+# least squares through the origin:
+#
+#   Amdahl:     1/S - 1/p = s (1 - 1/p)
+#   Gustafson:  p - S     = s (p - 1)
+
+from dataclasses import dataclass
+
+import numpy as np
+
+
+def karp_flatt(cores, speedup):
+    """Experimentally determined serial fraction (1/S - 1/p) / (1 - 1/p); NaN at p = 1."""
+    p = np.asarray(cores, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(p > 1, (1 / speedup - 1 / p) / (1 - 1 / p), np.nan)
+
+
+def _through_origin(u, v):
+    """Slope of u = s v along the last axis, ignoring NaNs."""
+    valid = ~np.isnan(u) & ~np.isnan(v)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return np.where(valid, u * v, 0).sum(axis=-1) / np.where(valid, v * v, 0).sum(axis=-1)
+
+
+def fit_amdahl(cores, speedup):
+    """Serial fraction s of S(p) = 1 / (s + (1 - s) / p) for each row of `speedup`."""
+    p = np.asarray(cores, dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return _through_origin(1 / np.asarray(speedup) - 1 / p, 1 - 1 / p)
+
+
+def fit_gustafson(cores, speedup):
+    """Serial fraction s of S(p) = p - s (p - 1) for each row of `speedup`."""
+    p = np.asarray(cores, dtype=np.float64)
+    return _through_origin(p - np.asarray(speedup), p - 1)
+
+
+def amdahl(cores, serial):
+    """Speedup predicted by Amdahl's law, shape (serial fractions, cores)."""
+    p = np.asarray(cores, dtype=np.float64)
+    s = np.asarray(serial, dtype=np.float64)[..., None]
+    return 1 / (s + (1 - s) / p)
+
+
+def gustafson(cores, serial):
+    """Speedup predicted by Gustafson's law, shape (serial fractions, cores)."""
+    p = np.asarray(cores, dtype=np.float64)
+    return p - np.asarray(serial, dtype=np.float64)[..., None] * (p - 1)
+
+
+@dataclass
+class ParallelScaling:
+    """Pooled throughput and derived metrics, arrays of shape (holes, cores)."""
+    holes: np.ndarray
+    cores: np.ndarray
+    runs: np.ndarray        # int64, number of runs in each cell
+    throughput: np.ndarray  # solutions per second, NaN for cells without runs
+
+    @property
+    def speedup(self):
+        """Throughput relative to the 1-core cell of the same hole count (NaN if unmeasured)."""
+        i = np.searchsorted(self.cores, 1)
+        base = self.throughput[:, i] if i < len(self.cores) and self.cores[i] == 1 else np.nan
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.throughput / np.reshape(base, (-1, 1))
+
+    @property
+    def efficiency(self):
+        return self.speedup / self.cores
+
+    @property
+    def karp_flatt(self):
+        return karp_flatt(self.cores, self.speedup)
+
+    @property
+    def amdahl_serial(self):
+        return fit_amdahl(self.cores, self.speedup)
+
+    @property
+    def gustafson_serial(self):
+        return fit_gustafson(self.cores, self.speedup)
+
+
+def parallel_scaling(cores, holes, solutions, wall_ms):
+    """ParallelScaling from per-run records, pooling all runs of each (holes, cores) cell."""
+    core_values, core = np.unique(np.asarray(cores), return_inverse=True)
+    hole_values, hole = np.unique(np.asarray(holes), return_inverse=True)
+    cell = hole * len(core_values) + core
+    size = len(hole_values) * len(core_values)
+
+    runs = np.bincount(cell, minlength=size)
+    found = np.bincount(cell, weights=np.asarray(solutions, dtype=np.float64), minlength=size)
+    seconds = np.bincount(cell, weights=np.asarray(wall_ms, dtype=np.float64) / 1000, minlength=size)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        throughput = np.where(runs > 0, found / seconds, np.nan)
+
+    shape = (len(hole_values), len(core_values))
+    return ParallelScaling(hole_values, core_values, runs.reshape(shape), throughput.reshape(shape))
@@ -0,0 +1,90 @@
+# Vectorized grouped statistics for the figure scripts.
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+
+def grouped_moments(df, by, column, **groupby_kwargs):
+    """Per-group count, mean and unbiased variance of `column` from one groupby pass.
+
+    Values are shifted by the overall mean before squaring, which keeps the
+    sum-of-squares formula accurate when the spread is small next to the mean.
+    NaNs are ignored.
+    """
+    x = df[column].astype(np.float64)
+    shift = x.mean()
+    if not np.isfinite(shift):
+        shift = 0.0
+    centered = x - shift
+    parts = pd.DataFrame({'x': centered, 'x2': centered * centered})
+    for key in [by] if isinstance(by, str) else by:
+        parts[key] = df[key]
+    agg = parts.groupby(by, **groupby_kwargs).agg(
+        count=('x', 'count'), total=('x', 'sum'), total2=('x2', 'sum'),
+    )
+    n = agg['count'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = agg['total'].to_numpy() / n
+        var = (agg['total2'].to_numpy() - n * mean * mean) / (n - 1)
+    return pd.DataFrame({
+        'count': agg['count'].to_numpy(),
+        'mean': mean + shift,
+        'var': np.maximum(var, 0.0),
+    }, index=agg.index)
+
+
+def grouped_t_interval(df, by, column, confidence=0.95, **groupby_kwargs):
+    """Mean and Student-t confidence interval of `column` for every group.
+
+    Matches stats.t.interval(confidence, n - 1, loc=mean, scale=stats.sem(x))
+    per group, but computes the critical values for all groups in one
+    vectorized t.ppf call. Groups with fewer than two values get NaN bounds.
+    Returns a frame with the group keys as columns plus count, mean, sem, low
+    and high.
+    """
+    m = grouped_moments(df, by, column, **groupby_kwargs)
+    n = m['count'].to_numpy(dtype=np.float64)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sem = np.sqrt(m['var'].to_numpy() / n)
+        dof = np.where(n > 1, n - 1, np.nan)
+    half = stats.t.ppf(0.5 + confidence / 2, dof) * sem
+    mean = m['mean'].to_numpy()
+    out = pd.DataFrame({
+        'count': m['count'].to_numpy(),
+        'mean': mean,
+        'sem': sem,
+        'low': mean - half,
+        'high': mean + half,
+    }, index=m.index)
+    return out.reset_index()
+
+
+def outlier_mask(df, by, column, k=1.5, method='iqr'):
+    """Boolean mask of the rows whose `column` lies within the fences of its group.
+
+    With method='iqr' the fences are [Q1 - k * IQR, Q3 + k * IQR]; with
+    method='mad' they are median -/+ k * MAD. Per-group bounds come from one
+    grouped quantile call and are broadcast back to the rows through the
+    group numbers, so no Python code runs per group. Rows with a NaN value or
+    a NaN group key are masked out.
+    """
+    groups = df.groupby(by, observed=True, sort=True, dropna=True)
+    code = groups.ngroup().to_numpy()
+    valid = code >= 0
+    code = np.where(valid, code, 0)
+    x = df[column].to_numpy(dtype=np.float64)
+
+    if method == 'iqr':
+        q = groups[column].quantile([0.25, 0.75]).to_numpy(dtype=np.float64).reshape(-1, 2)
+        spread = q[:, 1] - q[:, 0]
+        low, high = q[:, 0] - k * spread, q[:, 1] + k * spread
+    elif method == 'mad':
+        median = groups[column].median().to_numpy(dtype=np.float64)
+        deviation = pd.Series(np.abs(x - median[code])[valid])
+        mad = deviation.groupby(code[valid]).median().reindex(range(len(median))).to_numpy()
+        low, high = median - k * mad, median + k * mad
+    else:
+        raise ValueError(f'Unknown outlier method: {method!r}')
+
+    return valid & (x >= low[code]) & (x <= high[code])
@@ -0,0 +1,234 @@
+# Point decimation for the TikZ export path.
+#
+# tikzplotlib / matplot2tikz write every point of every series into the
+# .tex file, so a few thousand scatter points already slow down each LaTeX
+# compile. save_tikz thins the series of a figure to a per-figure point
+# budget before handing it to the exporter, then puts the full data back:
+#
+#   * lines use Largest-Triangle-Three-Buckets, which keeps the peaks and
+#     turns that define the shape of the curve,
+#   * scatters keep one point per occupied cell of the finest display-space
+#     grid that fits the budget, so dense clouds are thinned while isolated
+#     outliers survive.
+#
+# Both work in display coordinates, so log axes are thinned evenly.
+#
+# For clouds too dense to thin without losing their shape, save_hybrid
+# renders the scatters once to a PNG cropped to the axis box and writes the
+# axes, labels, lines and legend as vector pgfplots around it (see
+# figtools.pgfplots.Axis.image).
+
+import io
+
+import numpy as np
+
+from figtools.pgfplots import Axis
+
+DEFAULT_BUDGET = 2000
+
+
+def lttb(x, y, n_out):
+    """Indices of the `n_out` points Largest-Triangle-Three-Buckets keeps of (x, y)."""
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)
+    kept = np.empty(n_out, dtype=np.int64)
+    kept[0], kept[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        # Twice the area of the triangle (a, candidate, next bucket average)
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = lo + int(np.argmax(area))
+        kept[i + 1] = a
+    return kept
+
+
+def grid_thin(x, y, n_out):
+    """Indices of one point per occupied cell of the finest square grid with at most `n_out` cells in use."""
+    n = len(x)
+    if n_out >= n:
+        return np.arange(n)
+
+    def span(v):
+        lo, hi = v.min(), v.max()
+        return (v - lo) / (hi - lo) if hi > lo else np.zeros_like(v)
+
+    u, v = span(np.asarray(x, dtype=np.float64)), span(np.asarray(y, dtype=np.float64))
+
+    def first_per_cell(g):
+        cell = np.minimum((u * g).astype(np.int64), g - 1) * g + np.minimum((v * g).astype(np.int64), g - 1)
+        return np.unique(cell, return_index=True)[1]
+
+    lo, hi = 1, 2
+    while len(first_per_cell(hi)) <= n_out and hi < n:
+        lo, hi = hi, hi * 2
+    while hi - lo > 1:
+        mid = (lo + hi) // 2
+        if len(first_per_cell(mid)) <= n_out:
+            lo = mid
+        else:
+            hi = mid
+    return np.sort(first_per_cell(lo))
+
+
+def _series(fig):
+    """(kind, artist, axes) for every line and scatter in `fig`."""
+    from matplotlib.collections import PathCollection
+    for ax in fig.axes:
+        for line in ax.get_lines():
+            yield 'line', line, ax
+        for collection in ax.collections:
+            if isinstance(collection, PathCollection):
+                yield 'scatter', collection, ax
+
+
+def _thin_scatter(collection, kept):
+    """Keep only the points `kept`, along with their per-point sizes, colors and mapped values."""
+    n = len(collection.get_offsets())
+    getters = [collection.get_offsets, collection.get_sizes, collection.get_facecolors,
+               collection.get_edgecolors, collection.get_array]
+    setters = [collection.set_offsets, collection.set_sizes, collection.set_facecolors,
+               collection.set_edgecolors, collection.set_array]
+    saved = [get() for get in getters]
+    for value, setter in zip(saved, setters):
+        if value is not None and len(value) == n:
+            setter(value[kept])
+
+    def restore():
+        for value, setter in zip(saved, setters):
+            if value is not None:
+                setter(value)
+    return restore
+
+
+def _thin_line(line, kept):
+    x, y = line.get_xdata(orig=True), line.get_ydata(orig=True)
+    line.set_data(np.asarray(x)[kept], np.asarray(y)[kept])
+    return lambda: line.set_data(x, y)
+
+
+def save_tikz(path, save, budget=DEFAULT_BUDGET, figure=None, report=True, **kwargs):
+    """Decimate the series of `figure` (default: the current one) and write it with `save`.
+
+    `save` is the exporter, e.g. tikzplotlib.save or matplot2tikz.save, and
+    receives `path` and `kwargs`. The budget is shared between series in
+    proportion to their size. The figure keeps its full data afterwards.
+    Returns [(label, kept, total)] per series and prints it if `report`.
+    """
+    import matplotlib.pyplot as plt
+    fig = figure or plt.gcf()
+    fig.canvas.draw()  # settle the axis limits the display transforms depend on
+
+    series = []
+    for kind, artist, ax in _series(fig):
+        try:
+            if kind == 'line':
+                xy = np.column_stack([np.asarray(artist.get_xdata(orig=True), dtype=np.float64),
+                                      np.asarray(artist.get_ydata(orig=True), dtype=np.float64)])
+            else:
+                xy = np.asarray(artist.get_offsets(), dtype=np.float64)
+        except (TypeError, ValueError):
+            continue  # categorical or date data is left to the exporter untouched
+        series.append((kind, artist, ax, xy))
+    total = sum(len(xy) for *_, xy in series)
+
+    restores, rows = [], []
+    try:
+        for kind, artist, ax, xy in series:
+            n = len(xy)
+            share = max(3, int(budget * n / total)) if total > budget else n
+            kept = np.arange(n)
+            display = ax.transData.transform(xy) if n > share else None
+            # Points a log axis cannot place (<= 0) come out non-finite; leave such series whole
+            if display is not None and np.isfinite(display).all():
+                if kind == 'line':
+                    kept = lttb(display[:, 0], display[:, 1], share)
+                    restores.append(_thin_line(artist, kept))
+                else:
+                    kept = grid_thin(display[:, 0], display[:, 1], share)
+                    restores.append(_thin_scatter(artist, kept))
+            rows.append((artist.get_label(), len(kept), n))
+
+        if report:
+            for label, kept, n in rows:
+                print(f'{path}: {label}: kept {kept} of {n} points')
+            print(f'{path}: kept {sum(r[1] for r in rows)} of {total} points, dropped {total - sum(r[1] for r in rows)}')
+        save(path, **kwargs)
+    finally:
+        for restore in reversed(restores):
+            restore()
+    return rows
+
+
+LINESTYLES = {'--': 'dashed', ':': 'dotted', '-.': 'dashdotted'}
+
+
+def _color(rgba):
+    r, g, b = (float(c) for c in rgba[:3])
+    return f'rgb,1:red,{r:.4f};green,{g:.4f};blue,{b:.4f}'
+
+
+def _legend_label(artist, legend):
+    label = artist.get_label()
+    return label if legend and label and not label.startswith('_') else None
+
+
+def _raster(fig, ax, scatters, dpi):
+    """PNG bytes of `scatters` alone, cropped to the axis box of `ax`."""
+    hidden = [a for a in fig.get_children() + ax.get_children()
+              if a is not ax and a not in scatters and a.get_visible()]
+    for artist in hidden:
+        artist.set_visible(False)
+    try:
+        buffer = io.BytesIO()
+        box = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
+        fig.savefig(buffer, format='png', dpi=dpi, transparent=True, bbox_inches=box, pad_inches=0)
+    finally:
+        for artist in hidden:
+            artist.set_visible(True)
+    return buffer.getvalue()
+
+
+def save_hybrid(path, dpi=300, figure=None):
+    """Write the single-axes `figure` (default: the current one) as raster points under vector axes.
+
+    Scatters are rendered once at `dpi` into <path stem>-0.png, clipped to
+    the axis box; labels, title, log scales, lines and the legend are
+    written as pgfplots by figtools.pgfplots.Axis. Returns the rewritten paths.
+    """
+    import matplotlib.pyplot as plt
+    from matplotlib.collections import PathCollection
+    from matplotlib.colors import to_rgba
+    fig = figure or plt.gcf()
+    ax, = fig.axes
+    fig.canvas.draw()  # settle the limits the image is stretched over
+
+    box = ax.get_window_extent().transformed(fig.dpi_scale_trans.inverted())
+    options = {'scale_only_axis': True, 'width': f'{box.width:.3f}in', 'height': f'{box.height:.3f}in',
+               'xlabel': ax.get_xlabel() or None, 'ylabel': ax.get_ylabel() or None,
+               'title': ax.get_title() or None,
+               'xmode': 'log' if ax.get_xscale() == 'log' else None,
+               'ymode': 'log' if ax.get_yscale() == 'log' else None}
+    if not ax.spines['top'].get_visible() and not ax.spines['right'].get_visible():
+        options['axis_lines*'] = 'left'
+    axis = Axis(path, **options)
+    legend = ax.get_legend() is not None
+
+    scatters = [c for c in ax.collections if isinstance(c, PathCollection) and c.get_visible()]
+    if scatters:
+        marks = [({'only marks': True, 'mark': '*', 'color': _color(c.get_facecolors()[0])}, _legend_label(c, legend))
+                 for c in scatters if len(c.get_facecolors())]
+        (xmin, xmax), (ymin, ymax) = ax.get_xlim(), ax.get_ylim()
+        axis.image(_raster(fig, ax, scatters, dpi), xmin, xmax, ymin, ymax,
+                   [(mark, label) for mark, label in marks if label is not None])
+
+    for line in ax.get_lines():
+        if line.get_visible():
+            style = {'color': _color(to_rgba(line.get_color())),
+                     LINESTYLES.get(line.get_linestyle(), 'solid'): True}
+            axis.line(line.get_xdata(orig=True), line.get_ydata(orig=True), _legend_label(line, legend), **style)
+    return axis.write()
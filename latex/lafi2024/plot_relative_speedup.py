@@ -1,5 +1,11 @@
 import matplotlib.pyplot as plt
 import numpy as np
+import pandas as pd
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import fit_amdahl, fit_gustafson, load_csv, parallel_scaling
 
 # Data
 cores = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
@@ -15,6 +21,23 @@ relative_improvements = [
     [0.0, 0.4315, 0.7583, 1.0122, 1.2593, 1.4586, 1.6349, 1.7813, 1.8324, 1.8695]  # holes = 6
 ]
 
+# Usage: python plot_relative_speedup.py [runs.csv]
+# With a run log (columns cores, holes, solutions, wall_ms; one row per run),
+# the improvements are measured from the raw runs at whatever core counts it
+# covers, replacing the numbers above.
+if len(sys.argv) > 1:
+    runs = load_csv(sys.argv[1])
+    scaling = parallel_scaling(runs['cores'], runs['holes'], runs['solutions'], runs['wall_ms'])
+    cores, holes = scaling.cores, list(scaling.holes)
+    relative_improvements = scaling.speedup - 1
+    print(pd.DataFrame(scaling.efficiency, index=holes, columns=cores).round(3).rename_axis('efficiency'))
+    print(pd.DataFrame(scaling.karp_flatt, index=holes, columns=cores).round(3).rename_axis('karp-flatt'))
+
+# Serial fractions of Amdahl's and Gustafson's laws for each hole count
+speedup = np.asarray(relative_improvements) + 1
+print(pd.DataFrame({'amdahl': fit_amdahl(cores, speedup), 'gustafson': fit_gustafson(cores, speedup)},
+                   index=pd.Index(holes, name='holes')).round(4))
+
 # Plotting
 fig, ax = plt.subplots(figsize=(12, 8))
 
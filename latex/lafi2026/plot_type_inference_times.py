@@ -1,14 +1,23 @@
 #!/usr/bin/env python3
 # Outputs a single pgfplots scatter figure (log y) from inline CSV.
+# The axis goes to type_inference_times.tex, with one external table per k
+# (type_inference_times-<i>.dat) that is only rewritten when its data changes.
 # LaTeX preamble:
 #   \usepackage{pgfplots}
 #   \pgfplotsset{compat=1.18}
 #   \usepackage{float} % for [H]
 
 import csv
+import os
+import sys
 from io import StringIO
 from textwrap import dedent
 
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools.pgfplots import Axis
+
 RAW_DATA = dedent(r"""
     n,k,mean_ttfs_ms
     20,1,90.050
@@ -104,48 +113,29 @@ for r in rows:
 for k in by_k:
     by_k[k].sort(key=lambda x: x["n"])
 
-marks = ["*", "square*", "triangle*", "diamond*", "o", "x"]  # pgfplots-safe
-
-def table_for(series):
-    header = "n,mean_ttfs_ms"
-    body = "\n".join(f"{r['n']},{r['y']}" for r in series)
-    return header + "\n" + body
-
 # ---- Emit LaTeX ----
-out = []
-out += [
+ax = Axis(
+    "type_inference_times.tex",
+    width=r"\linewidth", height="3.6cm",
+    xlabel="$n$", ylabel="Mean TTFS (ms)",
+    ymode="log",
+    xmajorgrids=True, ymajorgrids=True,
+    tick_align="outside",
+    tick_label_style=r"font=\scriptsize",
+    label_style=r"font=\scriptsize",
+    legend_style=r"draw=none, fill=none, font=\scriptsize, at={(0.98,0.98)}, anchor=north east",
+    scaled_y_ticks="false",
+)
+for k in sorted(by_k.keys()):
+    n = np.array([r["n"] for r in by_k[k]])
+    y = np.array([r["y"] for r in by_k[k]])
+    ax.scatter(n, y, label=r"$k=" + str(k) + r"$")
+ax.write()
+
+out = [
     r"\begin{figure}[H]",
     r"  \centering",
-    r"  \begin{tikzpicture}",
-    r"    \begin{axis}[",
-    r"      width=\linewidth, height=3.6cm,",
-    r"      xlabel={$n$}, ylabel={Mean TTFS (ms)},",
-    r"      ymode=log,",
-    r"      xmajorgrids, ymajorgrids,",
-    r"      tick align=outside,",
-    r"      tick label style={font=\scriptsize},",
-    r"      label style={font=\scriptsize},",
-    r"      legend style={draw=none, fill=none, font=\scriptsize, at={(0.98,0.98)}, anchor=north east},",
-    r"      scaled y ticks=false,",
-    r"    ]",
-]
-
-leg = []
-for i, k in enumerate(sorted(by_k.keys())):
-    mark = marks[i % len(marks)]
-    tbl = table_for(by_k[k])
-    out += [
-        r"      \addplot+[only marks, mark=" + mark + r", mark size=1.5pt]",
-        r"        table[col sep=comma, x=n, y=mean_ttfs_ms]{",
-        tbl,
-        r"        };",
-        ]
-    leg.append(r"$k=" + str(k) + r"$")
-
-out += [
-    r"      \legend{" + ",".join(leg) + r"}",
-    r"    \end{axis}",
-    r"  \end{tikzpicture}",
+    r"  \input{type_inference_times.tex}",
     r"  \vspace{-0.4em}",
     r"  \caption{Type inference: mean TTFS vs.\ sequence length $n$ (log-scaled y).}",
     r"  \vspace{-0.6em}",
@@ -1,8 +1,12 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import scipy.stats as stats
 import tikzplotlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import grouped_t_interval, outlier_mask
 
 # Assuming data is already loaded into DataFrame 'data'
 
@@ -18,22 +22,12 @@ color_dict = {1: 'green', 2: 'blue', 3: 'red'}
 # Create a new column 'bins' in the dataframe to categorize 'numTks' into bins
 data['bins'] = pd.cut(data['numTks'], bins, include_lowest=True)
 
-# Define a function to filter outliers in a Series
-def filter_outliers(s):
-    Q1 = s.quantile(0.25)
-    Q3 = s.quantile(0.75)
-    IQR = Q3 - Q1
-    return s[(s >= Q1 - 50.5 * IQR) & (s <= Q3 + 50.5 * IQR)]
-
-# Apply this function to 'totalValid' for each 'totalEdts' type and bin
-data['totalValid'] = data.groupby(['bins', 'totalEdts'])['totalValid'].transform(filter_outliers)
+# Drop values outside [Q1 - k * IQR, Q3 + k * IQR] within each 'totalEdts' type and bin
+iqr_multiplier = 50.5
+data['totalValid'] = data['totalValid'].where(outlier_mask(data, ['bins', 'totalEdts'], 'totalValid', k=iqr_multiplier))
 
 # Calculate means and confidence intervals for each bin and each type
-grouped = data.groupby(['bins', 'totalEdts']).agg(
-    mean=('totalValid', 'mean'),
-    low=('totalValid', lambda x: stats.t.interval(0.95, len(x)-1, loc=np.mean(x), scale=stats.sem(x))[0]),
-    high=('totalValid', lambda x: stats.t.interval(0.95, len(x)-1, loc=np.mean(x), scale=stats.sem(x))[1])
-).reset_index()
+grouped = grouped_t_interval(data, ['bins', 'totalEdts'], 'totalValid', confidence=0.95)
 
 # Create figure and axis objects
 fig, ax = plt.subplots()
@@ -1,5 +1,6 @@
 import json
-import re
+import os
+import sys
 
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -8,6 +9,9 @@ import matplotlib.cm as cm
 import matplotlib
 import tikzplotlib
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import parse_patk
+
 
 def plot_data(data, filename):
     # Define a mapping from '60s' ... '5s' to numerical values
@@ -101,14 +105,10 @@ P@All= 1700s: 0.629, 1500s: 0.619, 1300s: 0.603, 1100s: 0.584, 900s: 0.562, 700s
 
 # conda deactivate && conda activate cstk
 if __name__ == '__main__':
-    pattern = r"(P@\w+)=((?:\s+\d+s:\s+\d+\.\d+,?)+)"
-    matches = re.findall(pattern, all_edits_sec)
-
-    data = []
-    for match in matches:
-        key = match[0].strip()
-        values = re.findall(r"(\d+)s:\s+(\d+\.\d+)", match[1])
-        data.append((key, {k: float(v) for k, v in values}))
+    # Read every *_edits_sec / *_edits_ms block in this file in one pass
+    with open(__file__) as f:
+        cube = parse_patk(f)
+    data = cube.plot_data('all_edits_sec')
 
     print(json.dumps(data))
 
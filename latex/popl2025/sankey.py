@@ -1,14 +1,33 @@
 from matplotlib.sankey import Sankey
 import matplotlib.pyplot as plt
 import tikzplotlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import load_csv, outcome_flows
+
+
+# Usage: python sankey.py [results.csv]
+# With a results CSV (a rank column, -1 if the human repair was not found, and
+# an optional outcome column with NG, NR, OOM or Error for failed instances),
+# the flows are counted from the raw results. Otherwise the numbers below are used.
+if len(sys.argv) > 1:
+    results = load_csv(sys.argv[1])
+    flows, labels = outcome_flows(results['rank'], results.get('outcome'), ks=(1, 10, 99),
+                                  labels=['Top-1', 'Top-[2-10]', 'Top-11-99', 'Top-100+'])
+else:
+    flows = [5136,-1725,-737,-730,-1646,-108,-48,-142]
+    labels = ['Total', 'Top-1', 'Top-[2-10]', 'Top-11-99', 'Top-100+', 'NG', 'NR', 'OOM']
+orientations = [0] + [-1] * (len(flows) - 1)
 
 fig = plt.figure(figsize = [10,10])
 ax = fig.add_subplot(1,1,1)
 
 Sankey(
-  ax=ax, flows = [5136,-1725,-737,-730,-1646,-108,-48,-142],
-  labels = ['Total', 'Top-1', 'Top-[2-10]', 'Top-11-99', 'Top-100+', 'NG', 'NR', 'OOM'],
-  orientations = [0, -1, -1, -1, -1, -1, -1, -1],
+  ax=ax, flows = flows,
+  labels = labels,
+  orientations = orientations,
   scale= 1/2500, trunklength=0.5,
   edgecolor = '#099368', facecolor = '#099368'
 ).finish()
@@ -1,24 +1,32 @@
-import numpy as np
 import matplotlib.pyplot as plt
 import matplot2tikz as tikzplotlib
-
-model2 = [30,4058,82,68,204,1297,2248,2,229,3897,7,179,107572,274,37101,119507,6,718,78,790,7,20,26,434,55,130,58,128,94,0,853,455,486,3,171,0,471,3357,64,125,97,25,3,1097,16,3,7227,26982,38,261,1,464,2,179,513,40,26,31,9,0,115,65,58,157,0,407,163,3,0,34,138,124,232,5,143,136178,337633,2190,45,133,1560,3,7,54,2,64,19,0,4757,391,1034,1264,50,1417,3240,588,859,485,6,9,105,7,330,862,46,168,177,4,15,23038,1252,127,151,19319,612,1895,8,0,182,3,0,1,3153,172,15899,364,16,8,8,66,47,10,69,0,0,9,89,7735,24,551,26,4,45,3879,162,1,324,139,1,93,140,0,49,35,357,1,323,2,495,17,517,134,31,0,1715,57,16678,119,27,9,2,2388,425,94,427,12,4750,2,0,2183,36,3774,36,175,31,55025,271,95,1222,54,99,1,446,70,66,2,192,191,839,18,4,67,200,533,5,544,62,26,39,0,4,2210,459,234,153,47,143,33,16,20,4071,3474,211,10,56567,10568,63,1347,1014,946,18,36,196,1,477,14,306,110,37,6,6,2901,4,38,5904,59,9,2,0,34,0,5,16501,69,22750,1665,4398,22163,0,346,1669,2,305,197,0,10894,1374,84,2742,7,13941,30,1264,2,717,450,2222,11,3451,164,62532,13,49,12,2,12,0,9,8054,660,73,79,109,105,0,422,80,29,4269,7,50,9,373,6405,3,67,33,53,75,22965,482,56,174,7,4581,735,173,362,23,11,2276,4593,2,314,0,83,3,41,335,3365,0,2318,543,69,4323,217,464,412,2508,71,514,438,1590,3,1254,94,9,0,613,4,11,53,233,43,3,12,27,0,89,156109,571,4268,26,37,1,599,15,5,70,481,0,27,3,2,13,5,7969,175,3225,13,51,19142,2859,31,91,14,13083,1133,25,2395,1,983,3,703,15,0,5776,15,5,81542,50,485,23,5199,25,64,10,941,1,60,52,93,1774,0,383598,53,5160,12,337,28,1627,347,1991,393,13,585,6804,1,2,12,0,3,4,14,118,1544,64,20,20,198,3,156,1189,13036,503,1,23,104,4,11,14,125,0,659,482,1328,734,0,16088,1433,8,2,108,86,7600,1515,423,157,94,102,146,5003,15,24,17,342,3829,10,20,6,159,4,3,69,2145,11,26,28,250,19,19006,16448,13,508,27,1,15,469,1985,0,38,11140,20,7193,3,840,1,24,123,11,513,80645,594,5,83,7,747,6,14,0,318,6,151,1925,949,3557,19,169,3,10,61,35,43,1408,3,9253,16896,288,2583,4,38,244,592,684,3136,40,1740,226,25,30,0,2878,63,83,57,5408,7,0,3006,101,3717,257,8,244,1169,1574,21,13,88,9,12,24,415,8704,61,3,479,204,0,6,548,3947,17,5,50,7,9,0,0,1,92,6,318,68,1,2,20,159,137,63,46,261,13,2,1,4,552,81,93,5,26,1546,10,148,1,38,124,230,14,1221,150,258,157,51,5,5372,8,746,9,705,139,2,1168,140808,9615,7,3507,18,32,13,161,8,3016,1176,166,1415,936,84,6,358,12,437,99,87,842,49,149,172,0,146419,141,32,16,3,1797,758,225,15146,693,213,19,1149,292,54,24,37,380,729,111,71,0,56,30,19,25,1983,342,52,260,2246,26,0,1262,291,1218,2841,148,450,716,1,71,128,9,7,53,125,8,88,216049,117,2,2,52,10646,3808,663,9,28,16579,141,33716,363,9085,227,35,27,1,0,11352,51,278,1,2096,1360,56,925,214,1,502,25,696,6,753,1015,27,0,170,23901,263,3202,87,0,526,412,361,482,540,16,425,10636,675,0,811,7544,20,699,170,60,196,1,7,1,2,8,22,42,65,1829,30493,0,37,1,0,10,46,1660,5733,607,149,5,20,61,356,343,36,2,4,134,276,801,1444,39,1189,303,64,50,7472,394,0,35,5441,1357,289,845,158,141,1980,2,1371,3377,101,0,127472,54,83,61,0,246,875,65,1146,59,32591,452,725,50,82,5,1,3,33,159,152,0,595,8,3,101,10,5036,19,0,61,76,0,8375,228,159,68,398,0,242,410,3789,28,1,123,622,612,15157,52,5955,92,0,37661,13674,940,1125,1926,19,0,10125,2823,1,331,2920,484,874,0,2,38,159,1,494,84,9788,594,1209,733,887,186,0,244,135,12,19,173,92,0,0,11,14,1,43,6,65,0,46,12,1,7,66,533,30,37,11,5475,8,1401,4466,0,69281,158,65,526,787,1148,212,23,2,14,0,83,73,29,132,4368,47,187,1,4271,4353,8900,4915,2940,45,2394,245,11198,10,113,42,1,9,0,5,172,5055,615,132,436,7,935,355,60,8,1,2,959,213,1,321,1762,0,186,13,10,90,80,258,628,47,2171,52,68,354,132,33,0,55,8,1963,45,35,1067,100,1,0,585,39,476,33,373,195682,349,432,610,801,900,3,72,13,0,32,91,236,6190,60,79,590,850,2248,475649,0,25,323,237,283,1091,10,11,702,288,19,8,30,309,794,3715,3,19,0,2617,64,184,111,345,0,23,18219,533,220,34,26,1,767,115,77,451,160,1168,441,40,2817,2,13,42,223,1,6731,5337,279,1,2,207,5759,30,328097,363,3214,36,20,66,58,1,2418,108,285,0,29,20,185,856,13991,305,3,55,38,2415,375,888,10,239,5,3298,2314,2608,66,75,363,3145,765,863,0,8,27,1,5146,9947,405,5665,13063,78,159,41,19,14833,7,128,74,876,1336,347,176,1,144,16794,0,117,155,23,477,1323,27,117,18,3,4779,303,180,1407,111,2776,42,409,560,2899,22081,890,1717,20,42,302,206,4585,0,128,2094,74,398,78,1,147,10,52,35,19389,4376,13,0,270,10721,2,22,0,20,9,12,196,11084,1014,32,23,425,15,53,0,653,55,4443,16,14,861,7,2891,2,61,0,6,2,28,31,0,347,3,199,20982,5,1088,344,107,578,64,605,90,3467,150,925,2324,6,0,0,191,139,227,3595,17,1648,1490,14,46,358,2469,1792,16,9,12,540,12,25615,26,865,549,402,2126,101,204,62,16,295,2,0,259,64,1076090,28980,6,83,5,22,430,16,1195,563,48,8704,2505,487,7,97,1189,42,3103,0,3,140,146,17,203,2228,378,99,2145,116,128,616,71,18,924,585,105,51,3,373,9,1,21,0,1435,321,149,22,385,20,340,5828,492,475152,77,62,6,1146,273,76,21,72,0,14,15,50307,0,4792,1628,0,3986,7,1,277,133,80,31,25736,6,7057,59,28,24,0,1,650,578,13,862,146,0,4,73,891,0,0,118,24,1216,300,134,789,118,89,167,5,195,16,4834,5,536,255,8064,160,1392,116,109,0,129,98,259,6,106,6,2771,7,2167,721,0,19,7787,1,0,433,219,90,131,0,1,0,2,1,69,132721,309,12157,127,36,12,173,509,622,16,484,37,3018,8,553,4646,48,0,3,2078,1438,16,231,36,6,3,492,87,10370,49,328,10,1512,7414,76248,5571,2365,4,4711,642,481,10,84,9,950,6,11,2,13454,18,63,168,1017,3,481,108,57,4,276,2,0,4,2,69002,4437,89,199,753,85,3,16,31,599,15618,194,6148,76,49,4443,5664,0,1419,45,2,4588,3642,320,51,66172,515,4,132,2,27,115,2,0,2335,304,20,4042,28,4,120,97,788,49,9,145,580,208,394517,32892,254,0,99,515,0,4,10,1453,15,17,1,93,11,0,937,10,7702,38,1279,0,234,11,33,24727,242,60,19,186,44,152,84,5,235,5172,1150,661,331,225,55,21,300,14,5,165,0,110,30119,1,2229,1118,16,0,23,7,6646,368,13,30,50,16,1,2753,282,1372,116,1154,22,6,3,0,85430,469,46,5,86,30,0,43,22,9,22,185,9900,1,362,1189,124,190,1408,4708,12253,13,2,1526,26,183,166901,5,149,42,5]
-model1 = [0,4058,269,0,0,1297,2248,0,9,1,0,0,107572,2,37101,119507,7,0,6,5,1,1,3,0,0,5,3,0,1,6,31,0,0,0,1,0,56,0,0,0,1,1,1,42,0,3,7227,26982,0,3,6,7,0,0,0,0,0,9,0,5,6,0,1,0,0,0,1,2,0,3,1,0,4,4,3,136178,337633,2190,2,1,1560,0,25,5,0,0,16,0,4757,17,0,0,3,3,3240,0,0,12,3,1,4,1,42,0,0,0,12,0,0,23038,1252,0,0,19319,2,1895,1,0,2,0,0,84,3153,0,15899,3,2,0,2,0,0,5,0,3,0,0,0,7735,0,0,0,0,1,3879,0,1,0,1,0,0,1,0,0,2,3,0,3,0,29,2,0,0,4,0,1715,0,16678,7,0,0,0,2388,22,1,8,1,4750,0,0,2183,0,3774,5,0,0,55025,0,3,0,1,0,3,2,0,0,3,0,0,0,21,0,7,0,8,3,0,0,0,1,0,0,2210,5,0,0,0,12,5,1,0,4071,3474,4,2,56567,4,39,0,0,0,0,3,1,1,1,8,10,5,0,1,3,2901,0,0,5904,0,0,1,38,1,545,2,16501,0,22750,1665,4398,22163,1,0,1669,1,2,2,13,10894,1374,1,2742,0,13941,0,1264,0,0,12,2222,0,3451,0,62532,1,0,0,258,0,55,2,8054,1,0,3,2,0,0,7,0,3,4269,0,0,1,2,6405,0,176,0,0,0,22965,0,0,0,17,4581,0,0,0,12,1,2276,0,1,0,0,0,1,0,0,3365,0,2318,5,0,4323,10,2,4,2508,0,12,2,1590,0,132,1,0,0,0,34,0,0,1,3,0,0,0,0,0,156109,7,0,0,0,1,0,1,0,48,0,2,0,8,0,3,0,7969,4,3225,0,0,19142,2859,13,2,59,13083,0,1,2395,0,482,0,0,0,0,5776,3,2,81542,4,15,0,5199,88,2,16,2,6,1,0,2,1774,5,383598,0,5160,0,1,0,1627,0,9,0,4,0,6804,0,0,5,1,1,0,1,0,1544,0,1,0,39,0,1,0,13036,3,0,0,0,0,0,4,2,0,0,0,1328,0,1,16088,1433,5,0,6,0,7600,1515,4,1,5,4,0,5003,4,0,4,1,3829,0,0,0,6,0,4,0,2145,3,1,0,1,2,19006,16448,3,0,1,0,2,1,0,0,1,11140,0,7193,0,2,0,0,4,2,0,80645,0,1,1,10,6,5,0,1,0,0,1,1925,2,3557,0,1,44,2,0,3,1,1408,1,9253,16896,1,2583,0,0,0,0,2,3136,5,1740,0,83,0,0,2878,0,7,0,5408,2,1,0,0,1,0,2,0,0,1574,0,3,15,3,0,4,3,8704,0,3,0,0,0,0,1,3947,2,0,4,0,170,0,2,0,0,9,4,1,0,1,5,1,0,0,1,0,0,1,2,1,2,0,97,0,0,6,0,1,32,0,0,3,41,1,4,0,0,0,1,5372,2,0,2,7,2,0,41,140808,9615,0,3507,8,2,2,21,5,3016,5,0,1415,0,0,7,7,2,14,0,0,5,0,15,0,0,146419,1,1,0,1,11,0,27,15146,5,5,0,5,0,6,4,1,0,0,0,0,0,10,3,1,98,1983,8,0,0,2246,1,1,1262,0,2,2841,2,0,0,0,2,2,8,0,0,1,0,4,216049,0,0,1,1,10646,3808,42,0,5,16579,0,33716,3,9085,0,12,1,0,0,11352,1,0,0,2096,1360,0,1,1,1,2,5,0,2,0,0,9,0,0,23901,5,3202,0,4,13,1,3,0,0,0,0,10636,3,4,1,7544,2,5,0,0,0,0,2,0,0,1,0,0,1,80,30493,0,0,5,7,0,0,1660,5733,1,0,0,2,0,0,2,1,2,0,1,0,6,0,0,0,1,0,4,7472,63,0,3,5441,0,4,0,0,12,1980,1,0,3377,1,2,127472,49,2,0,0,21,0,0,0,0,32591,0,4,0,0,0,0,4,0,6,5,4,0,1,1,5,0,5036,0,0,0,0,0,2,3,1,0,0,1,0,1,46,19,4,0,7,1,15157,31,5955,6,0,37661,13674,0,0,1926,3,4,10125,2823,0,0,2920,0,0,1,0,0,0,2,3,0,9788,1,1,0,0,1,7,0,0,0,0,4,5,1,0,0,1,1,0,0,2,0,0,0,0,0,13,1,1,5,84,5475,0,0,4466,1,69281,6,1,1,7,3,0,1,1,13,0,5,1,2,0,4368,0,4,2,4271,4353,8900,1,2940,5,2394,10,11198,0,0,5,0,0,0,1,40,5055,2,29,21,3,0,8,3,0,0,2,18,0,1,0,1762,0,1,0,0,1,1,2,0,1,2171,0,6,3,0,6,0,0,0,1963,0,0,1,0,0,3,0,0,0,0,0,195682,16,5,4,6,2,0,2,0,0,0,4,0,6190,2,1,0,8,2248,475649,0,1,0,0,0,0,6,2,1,0,7,0,0,0,0,3715,0,0,0,2617,2,17,1,114,0,0,18219,8,26,0,0,223,1,2,0,0,1,5,0,5,17,0,0,28,0,0,6731,5337,0,1,0,0,5759,0,328097,2,3214,0,0,1,4,0,2418,2,5,1,8,0,177,13,13991,1,29,1,0,2415,2,0,6,2,0,3298,2314,2608,1,8,0,0,0,1,0,0,8,5,5146,9947,0,5665,13063,0,1,0,29,14833,9,0,3,0,1336,0,0,0,4,16794,4,1,3,0,5,1,1,0,2,2,4779,4,0,1407,1,2776,1,0,2,2899,22081,0,1717,0,0,1,0,4585,7,0,2094,8,5,6,25,2,1,0,0,19389,4376,0,4,198,10721,2,7,4,0,0,1,4,11084,0,4,0,0,0,0,0,16,3,4443,1,0,0,56,2891,9,0,0,6,3,3,116,0,28,0,0,20982,0,3,2,2,0,2,6,4,3467,0,1,2324,1,0,0,0,19,6,3595,0,1648,1490,1,6,0,2469,1792,2,0,3,0,1,25615,6,13,0,0,2126,0,8,5,1,0,0,3,0,2,1076090,28980,0,4,0,2,0,1,0,1,2,8704,2505,1,3,0,0,19,3103,0,5,0,0,0,0,2228,2,0,2145,1,1,6,0,0,0,0,0,0,0,0,0,41,0,8,2,2,6,6,37,0,2,1,0,475152,1,1,0,1,7,0,0,1,0,128,0,50307,0,4792,1628,37,3986,0,1,8,1,0,1,25736,0,7057,2,0,0,0,0,0,9,0,8,0,1,0,0,5,0,0,3,0,0,1,0,13,0,1,2,21,1,0,4834,1,0,0,8064,1,104,0,0,1,151,2,19,0,6,0,1,0,2167,1,4,1,7787,0,2,2,8,0,0,0,2,0,0,7,16,132721,0,12157,5,0,0,18,1,0,0,1,1,3018,0,3,4646,24,0,0,2078,1438,0,0,5,0,5,2,2,10370,10,14,0,1512,7414,76248,5571,2,0,4711,28,0,4,1,0,0,0,100,1,13454,13,0,1,5,0,7,89,1,0,2,0,5,1,0,69002,4437,0,12,558,0,0,16,0,39,15618,0,6148,1,0,4443,5664,1,1419,1,0,0,3642,0,0,66172,0,0,0,0,1,0,0,0,2335,0,0,4042,2,0,0,0,6,0,1,0,0,0,394517,32892,0,10,0,0,0,6,1,2,0,2,9,2,0,1,150,0,7702,4,0,2,4,0,0,24727,1,5,1,1,1,72,0,0,0,5172,1150,15,6,0,2,1,2,0,0,0,0,0,30119,1,2229,0,0,0,2,8,6646,1,0,0,0,16,6,2753,0,0,1,1,1,0,0,9,85430,0,0,0,0,0,0,3,2,2,23,0,1,3,0,0,0,0,0,4708,12253,3,0,1526,0,0,166901,0,30,1,0,]
-sorted_model1 = np.sort(model1)
-sorted_model2 = np.sort(model2)
-
-n1 = len(model1)
-cdf_model1 = np.arange(1, n1 + 1) / n1
-
-n2 = len(model2)
-cdf_model2 = np.arange(1, n2 + 1) / n2
-
-plt.plot(sorted_model1, cdf_model1, label='Model 1')
-plt.plot(sorted_model2, cdf_model2, label='Model 2')
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from figtools.ecdf import ecdf, threshold_table
+from figtools.ranks import load_models
+
+# Per-instance ranks are stored as ranks/<model>.npy
+# Inputs: ranks/model1.npy ranks/model2.npy
+models = load_models(['model1', 'model2'])
+labels = {'model1': 'Model 1', 'model2': 'Model 2'}
+threshold = 1000
+point_budget = 200  # steps kept per curve in the TikZ output
+
+# One step per distinct rank, thinned in log space, with a 95% DKW band
+curves = {name: ecdf(ranks) for name, ranks in models.items()}
+for name, curve in curves.items():
+    shown = curve.downsample(point_budget)
+    low, high = shown.band(0.95)
+    line, = plt.step(shown.x, shown.cdf, where='post', label=labels[name])
+    plt.fill_between(shown.x, low, high, step='post', color=line.get_color(), alpha=0.2, linewidth=0)
+
+print(threshold_table(curves, [threshold]).to_string(index=False))
 
 plt.xscale('log')
 
-plt.axvline(x=1000, color='red', linestyle='--')
+plt.axvline(x=threshold, color='red', linestyle='--')
 
 plt.xlabel('Rank (log scale)')
 plt.ylabel('Cumulative Probability')
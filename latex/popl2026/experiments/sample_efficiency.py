@@ -1,56 +1,38 @@
 import pandas as pd
 import matplotlib.pyplot as plt
-import numpy as np
 import tikzplotlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from figtools import load_csv, read_harness_csv, sample_efficiency
 
 # Load the data into a pandas DataFrame
-data = pd.read_csv('bar_hillel_niagara.csv', sep=r'\s*,\s*')
+data = load_csv('bar_hillel_niagara.csv', reader=read_harness_csv)
 
-max_samples = data['samples'].max() + 1
+max_samples = data['samples'].max()
 print(f"Max samples: {max_samples}")
-# Create buckets for the 'samples' column in increments of 5
-buckets = np.arange(0, max_samples, 10)
-bucket_labels = buckets[1:]  # Label each bucket by its upper limit
-
-# Initialize a DataFrame to hold the percentage of instances per bucket and level
-percentages = pd.DataFrame(columns=bucket_labels)
 
-# Calculate percentages for each 'lev'
-for lev in sorted(data['lev'].unique()):
-    print("Calculating percentages for lev =", lev)
-    lev_data = data[data['lev'] == lev]
-    counts, _ = np.histogram(lev_data['samples'], bins=buckets)
-    cum_counts = np.cumsum(counts) / len(lev_data) * 100  # Calculate cumulative percentage
-    percentages.loc[lev] = cum_counts
+# Cumulative Precision@All for log-spaced sample budgets, all levels at once
+bins_per_decade = 10
+efficiency = sample_efficiency(data['samples'].to_numpy(), data['lev'].to_numpy(), bins_per_decade)
+percentages = pd.DataFrame(efficiency.precision * 100, index=efficiency.levels, columns=efficiency.edges)
 
 print('Done calculating percentages')
 
 # Plotting
 fig, ax = plt.subplots(figsize=(10, 6))
 
-# Plot a separate bar for each 'lev'
+# Plot a separate step curve for each 'lev'
 for lev in percentages.index:
     print(lev)
-    ax.bar(np.arange(len(percentages.columns)), percentages.loc[lev], 1.0, label=f"$\Delta_L={lev}$")
+    ax.step(percentages.columns, percentages.loc[lev], where='post', marker='o', markersize=2, label=f"$\\Delta_L={lev}$")
 
 ax.set_xlabel('Samples drawn (log scale)')
 ax.set_ylabel('Precision@All')
 ax.set_title('Sample Efficiency')
-
-# Calculate tick spacing to only show about ten or so ticks across the x-axis
-total_buckets = len(bucket_labels)
-desired_ticks = 10
-tick_spacing = max(1, total_buckets // desired_ticks)  # Ensure at least 1 to avoid division by zero
-
-ticks = np.arange(0, total_buckets, tick_spacing)
-# tick_labels = [bucket_labels[int(i)] for i in ticks]
-tick_labels = [f'$10^{i}$' for i in range(-2, 6)]
-
-ax.set_xticks(ticks)
 ax.set_xscale('log')
 
-ax.set_xticklabels(tick_labels)  # Optional rotation for better label readability
-
 # Put the legend in the bottom right corner
 # ax.legend()
 
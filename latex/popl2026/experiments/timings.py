@@ -1,10 +1,15 @@
 import matplotlib.pyplot as plt
-import pandas as pd
+import numpy as np
 import matplot2tikz as tikzplotlib
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from figtools import fit_scaling, load_csv, save_hybrid, save_tikz
 
 
 # Load your data (assuming it's in 'data.csv')
-df = pd.read_csv("timings.csv")
+df = load_csv("timings.csv")
 
 # Calculate Y values
 df['y'] = df['total_ms']
@@ -19,6 +24,24 @@ for lev_dist in df['lev_dist'].unique():
     data = df[df['lev_dist'] == lev_dist]
     ax.scatter(data['length'], data['y'], color=color_map[lev_dist], label=f'lev\_dist = {lev_dist}', s=60)
 
+# Fit y = a * length^b and y = a * e^(b * length) per lev_dist (robust, in log space)
+# Bootstrap in-process: this script has no __main__ guard for a process pool
+fits = {model: fit_scaling(df['length'], df['y'], df['lev_dist'], model=model, workers=1) for model in ('power', 'exp')}
+for model, fit in fits.items():
+    print(f'{model} fit, 95% bootstrap interval on b:')
+    print(fit.table().to_string(index=False))
+
+# Expected latency beyond the measured lengths
+unseen = np.array([2, 4]) * df['length'].max()
+for lev_dist in fits['power'].levels:
+    print(f'lev_dist = {lev_dist}: power {fits["power"].predict(lev_dist, unseen).round()} ms,'
+          f' exp {fits["exp"].predict(lev_dist, unseen).round()} ms at lengths {unseen}')
+
+# Overlay the power-law curves on the scatter
+lengths = np.linspace(df['length'].min(), df['length'].max(), 100)
+for lev_dist in fits['power'].levels:
+    ax.plot(lengths, fits['power'].predict(lev_dist, lengths), color=color_map[lev_dist], linestyle='--')
+
 # Labels and legend
 ax.set_yscale('log')
 
@@ -31,4 +54,10 @@ plt.rcParams.update({"text.usetex": True, "pgf.rcfonts": False})
 # Save as a .pgf file (LaTeX ready)
 # plt.show()
 # plt.savefig('timings.pgf')
-tikzplotlib.save("timings.tex")
+# Usage: python timings.py [--raster]
+# --raster draws the scatter points as a high-DPI PNG under vector pgfplots axes
+if '--raster' in sys.argv[1:]:
+    save_hybrid("timings.tex")
+else:
+    # Thin dense series to the point budget before writing the TikZ file
+    save_tikz("timings.tex", tikzplotlib.save)
@@ -1,13 +1,14 @@
-import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import matplot2tikz
+import os
+import sys
 
-# Read the CSV file
-df = pd.read_csv('intersections.csv')
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..'))
+from figtools import load_csv, read_harness_csv, save_hybrid, save_tikz
 
-# Strip any leading/trailing spaces from column names
-df.columns = df.columns.str.strip()
+# Read the CSV file (header padding is stripped, fields are typed)
+df = load_csv('intersections.csv', reader=read_harness_csv)
 
 # Define the required columns
 required_cols = ['length', 'lev_margin', 'lang_size']
@@ -51,8 +52,13 @@ ax.spines['right'].set_visible(False)
 ax.xaxis.set_ticks_position('bottom')
 ax.yaxis.set_ticks_position('left')
 
-# Save the plot as TikZ code
-matplot2tikz.save('scatter_plot.tex')
+# Usage: python plot_lang_int_size.py [--raster]
+# --raster draws the scatter points as a high-DPI PNG under vector pgfplots axes
+if '--raster' in sys.argv[1:]:
+    save_hybrid('scatter_plot.tex')
+else:
+    # Save the plot as TikZ code, thinning dense series to the point budget
+    save_tikz('scatter_plot.tex', matplot2tikz.save)
 
 # Close the plot to free memory
 plt.close()
\ No newline at end of file
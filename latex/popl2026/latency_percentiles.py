@@ -0,0 +1,35 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import read_latency_table
+
+# Usage: python latency_percentiles.py [log.csv ...]
+# Shards of the same run (or several runs) are merged into one histogram per
+# (length bin, lev_dist) before the percentiles are read off.
+logs = sys.argv[1:] or ['throughput_log.csv']
+bin_size = 10
+percentiles = (50, 90, 99, 99.9)
+
+table = read_latency_table(logs, by=('length', 'lev_dist'), columns=('total_ms', 'sample_ms'),
+                           bin_widths={'length': bin_size})
+stats = table.percentile_table(percentiles)
+print(stats.to_string(index=False))
+
+# Write the total_ms tail as a LaTeX table
+header = ' & '.join([r'$|\err\sigma|$', r'$\Delta$'] + [f'p{q:g}' for q in percentiles])
+lines = [
+    r'\begin{tabular}{cc' + 'r' * len(percentiles) + '}',
+    r'\hline',
+    header + r' \\',
+    r'\hline',
+]
+for _, row in stats.iterrows():
+    low = int(row['length'])
+    cells = [f'[{low}, {low + bin_size})', str(int(row['lev_dist']))]
+    cells += [f"{row[f'total_ms_p{q:g}'] / 1000:.1f}s" for q in percentiles]
+    lines.append(' & '.join(cells) + r' \\')
+lines += [r'\hline', r'\end{tabular}']
+
+with open('latency_percentiles.tex', 'w') as f:
+    f.write('\n'.join(lines) + '\n')
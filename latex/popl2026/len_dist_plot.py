@@ -1,3 +1,12 @@
+import os
+import re
+import sys
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import load_csv, read_harness_csv, topk_by_length
+
 input_string = """
 (|σ|∈[0, 10), Δ=1): Top-1/total: 32 / 38 ≈ 0.8421052631578947
 (|σ|∈[0, 10), Δ=2): Top-1/total: 29 / 31 ≈ 0.9354838709677419
@@ -25,37 +34,29 @@ input_string = """
 (|σ|∈[70, 80), Δ=3): Top-1/total: 19 / 78 ≈ 0.24358974358974358
 """
 
-# Split the input string into lines
-lines = input_string.strip().splitlines()
-
-# Initialize lists for each Δ category
-green = []  # Δ=1
-blue = []   # Δ=2
-orange = [] # Δ=3
-
-# Process lines in groups of three (one group per bucket)
-for i in range(0, 24, 3):
-    green.append(float(lines[i].split("≈")[1].strip()))
-    blue.append(float(lines[i+1].split("≈")[1].strip()))
-    orange.append(float(lines[i+2].split("≈")[1].strip()))
-
-# Define x-values for the eight buckets
-x_values = [0, 10, 20, 30, 40, 50, 60, 70]
-
-# Generate coordinate strings
-green_coords = " ".join([f"({x}, {val})" for x, val in zip(x_values, green)])
-blue_coords = " ".join([f"({x}, {val})" for x, val in zip(x_values, blue)])
-orange_coords = " ".join([f"({x}, {val})" for x, val in zip(x_values, orange)])
-
-# Define the TikZ template
-tikz_template = r"""
-\addplot[green, fill=green!50] coordinates {{ {green_coords} }};
-\addplot[blue, fill=blue!50] coordinates {{ {blue_coords} }};
-\addplot[orange, fill=orange!50] coordinates {{ {orange_coords} }};
-"""
-
-# Generate the TikZ code
-tikz_code = tikz_template.format(green_coords=green_coords, blue_coords=blue_coords, orange_coords=orange_coords)
+# Usage: python len_dist_plot.py [records.csv [width [k]]]
+# With a records CSV (columns length, lev_dist, rank), Top-k/total is computed
+# from the raw instances. Otherwise the pasted summary above is used.
+width = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+k = int(sys.argv[3]) if len(sys.argv) > 3 else 1
+
+if len(sys.argv) > 1:
+    records = load_csv(sys.argv[1], reader=read_harness_csv)
+    result = topk_by_length(records['length'], records['lev_dist'], records['rank'], width=width, ks=[k])
+    series = {lev: result.series(lev, k) for lev in result.levels[:3]}
+else:
+    # Each summary line reads "(|σ|∈[lo, hi), Δ=d): Top-1/total: hits / total ≈ p"
+    rows = np.array(re.findall(r'\[(\d+), \d+\), Δ=(\d+)\): Top-\d+/total: (\d+) / (\d+)', input_string), dtype=np.int64)
+    lo, delta, hits, total = rows.T
+    series = {d: (lo[delta == d], hits[delta == d] / total[delta == d]) for d in np.unique(delta)}
+
+# One series per Δ category, coloured in order (green: Δ=1, blue: Δ=2, orange: Δ=3);
+# records with fewer levels simply give fewer series
+colors = ['green', 'blue', 'orange']
+tikz_code = "\n"
+for d, color in zip(sorted(series), colors):
+    coords = " ".join([f"({x}, {val})" for x, val in zip(*series[d])])
+    tikz_code += f"\\addplot[{color}, fill={color}!50] coordinates {{ {coords} }};\n"
 
 # Output the result
-print(tikz_code)
\ No newline at end of file
+print(tikz_code)
@@ -1,5 +1,6 @@
 import json
-import re
+import os
+import sys
 
 import matplotlib.pyplot as plt
 from mpl_toolkits.mplot3d import Axes3D
@@ -8,6 +9,9 @@ import matplotlib.cm as cm
 import matplotlib
 import tikzplotlib
 
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import load_csv, parse_patk, patk_from_records, read_harness_csv
+
 
 def plot_data(data, filename, lev):
     # Define a mapping from '60s' ... '5s' to numerical values
@@ -91,18 +95,21 @@ P@All= 900000s: 0.848, 800000s: 0.847, 700000s: 0.846, 600000s: 0.843, 500000s:
 
 # conda deactivate && conda activate cstk
 if __name__ == '__main__':
-    pattern = r"(P@\w+)=((?:\s+\d+s:\s+\d+\.\d+,?)+)"
-    # Get variable name with "3" in it
+    # Read every lev_<dist>_edits_sec block in this file in one pass
+    with open(__file__) as f:
+        cube = parse_patk(f)
     dist = 2
-    variable_name = f'lev_{dist}_edits_sec'
-    lev_edits_sec = globals()[variable_name]
-    matches = re.findall(pattern, lev_edits_sec)
-
-    data = []
-    for match in matches:
-        key = match[0].strip()
-        values = re.findall(r"(\d+)s:\s+(\d+\.\d+)", match[1])
-        data.append((key, {k: float(v) for k, v in values}))
+    label = f'lev_{dist}_edits_sec'
+    # Usage: python repair_plot.py [records.csv]
+    # With a records CSV (columns lev, milliseconds, rank, like bar_hillel_niagara.csv),
+    # P@k is recomputed from the raw instances at the same budgets instead.
+    if len(sys.argv) > 1:
+        records = load_csv(sys.argv[1], reader=read_harness_csv)
+        # Only the budgets of the plotted block; the other blocks use other scales
+        cube = patk_from_records(records['milliseconds'], records['rank'], records['lev'], cube.level_budgets(label))
+        if label not in cube.levels:
+            sys.exit(f'{sys.argv[1]} has no instances at Δ={dist}')
+    data = cube.plot_data(label)
 
     print(json.dumps(data))
 
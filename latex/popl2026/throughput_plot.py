@@ -1,67 +1,72 @@
 import pandas as pd
 import matplotlib.pyplot as plt
 import numpy as np
-import scipy.stats as stats
 import tikzplotlib
+import os
+import sys
 
-# Assuming data is already loaded into DataFrame 'data'
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+from figtools import bootstrap_grouped_mean, load_csv, outlier_mask, save_tikz, stage
 
-data = pd.read_csv('throughput_log.csv')  # replace with your actual file path
+# Load -> filter -> bin -> aggregate, cached on disk: a change to the styling
+# below reuses the stored aggregates instead of recomputing them. A hit skips
+# this body, so it must not modify `data` or print.
+@stage
+def aggregate(data, bin_size, iqr_multiplier):
+    # Create bins
+    bins = np.arange(min(data['length']), max(data['length']) + bin_size, bin_size)
 
-# Create bins
-bin_size = 2
-bins = np.arange(min(data['length']), max(data['length']) + bin_size, bin_size)
+    # Categorize 'numTks' into bins, on a copy: the caller's frame is left untouched
+    data = data.assign(bins=pd.cut(data['length'], bins, include_lowest=True))
 
-# Create a color dictionary
-color_dict = {1: 'green', 2: 'blue', 3: 'red', 4: 'orange'}
+    # Drop values outside [Q1 - k * IQR, Q3 + k * IQR] within each 'lev_dist' type and bin
+    data['total_samples'] = data['total_samples'].where(outlier_mask(data, ['bins', 'lev_dist'], 'total_samples', k=iqr_multiplier))
 
-# Create a new column 'bins' in the dataframe to categorize 'numTks' into bins
-data['bins'] = pd.cut(data['length'], bins, include_lowest=True)
+    # Calculate means and percentile bootstrap intervals for each bin and each type;
+    # sample counts are heavy-tailed, so Student-t intervals are misleading here
+    return bootstrap_grouped_mean(data, ['bins', 'lev_dist'], 'total_samples', n_resamples=10000, confidence=0.95, seed=0)
 
-print(data.head())
-print(data['lev_dist'].unique())
 
-# Define a function to filter outliers in a Series
-def filter_outliers(s):
-    Q1 = s.quantile(0.25)
-    Q3 = s.quantile(0.75)
-    IQR = Q3 - Q1
-    return s[(s >= Q1 - 50.5 * IQR) & (s <= Q3 + 50.5 * IQR)]
+# The bootstrap may run in worker processes, which re-import this script under spawn
+if __name__ == '__main__':
+    # Assuming data is already loaded into DataFrame 'data'
 
-# Apply this function to 'total_samples' for each 'lev_dist' type and bin
-data['total_samples'] = data.groupby(['bins', 'lev_dist'])['total_samples'].transform(filter_outliers)
+    data = load_csv('throughput_log.csv')  # replace with your actual file path
 
+    print(data.head())
+    print(data['lev_dist'].unique())
 
-# Calculate means and confidence intervals for each bin and each type
-grouped = data.groupby(['bins', 'lev_dist']).agg(
-    mean=('total_samples', 'mean'),
-    low=('total_samples', lambda x: stats.t.interval(0.95, len(x)-1, loc=np.mean(x), scale=stats.sem(x))[0]),
-    high=('total_samples', lambda x: stats.t.interval(0.95, len(x)-1, loc=np.mean(x), scale=stats.sem(x))[1])
-).reset_index()
+    bin_size = 2
+    iqr_multiplier = 50.5
+    grouped = aggregate(data, bin_size, iqr_multiplier)
 
-# Create figure and axis objects
-fig, ax = plt.subplots()
+    # Create a color dictionary
+    color_dict = {1: 'green', 2: 'blue', 3: 'red', 4: 'orange'}
 
-# Plot mean lines with error bars for each type
-for edts_type in data['lev_dist'].unique():
-    temp_data = grouped[grouped['lev_dist'] == edts_type]
-    ax.errorbar(range(len(temp_data)), temp_data['mean'],
-                # yerr=[temp_data['mean']-temp_data['low'], temp_data['high']-temp_data['mean']],
-                color=color_dict[edts_type],
-                fmt='-o')
+    # Create figure and axis objects
+    fig, ax = plt.subplots()
 
-# Set labels and title
-ax.set_xticks(range(len(grouped['bins'].unique())))
-ax.set_xticklabels([str(b) for b in grouped['bins'].unique()])
-ax.set_xlabel('numTks (binned)')
-ax.set_ylabel('total_samples (mean)')
-ax.set_title('Line plot of numTks vs totalValid with error bars')
-ax.set_yscale('log')
+    # Plot mean lines with error bars for each type
+    for edts_type in data['lev_dist'].unique():
+        temp_data = grouped[grouped['lev_dist'] == edts_type]
+        ax.errorbar(range(len(temp_data)), temp_data['mean'],
+                    yerr=[temp_data['mean']-temp_data['low'], temp_data['high']-temp_data['mean']],
+                    color=color_dict[edts_type],
+                    fmt='-o')
 
+    # Set labels and title
+    ax.set_xticks(range(len(grouped['bins'].unique())))
+    ax.set_xticklabels([str(b) for b in grouped['bins'].unique()])
+    ax.set_xlabel('numTks (binned)')
+    ax.set_ylabel('total_samples (mean)')
+    ax.set_title('Line plot of numTks vs totalValid with error bars')
+    ax.set_yscale('log')
 
-# Add a legend
-# ax.legend()
 
-# Display the plot
-# plt.show()
-tikzplotlib.save("throughput.tex")
\ No newline at end of file
+    # Add a legend
+    # ax.legend()
+
+    # Display the plot
+    # plt.show()
+    # Thin dense series to the point budget before writing the TikZ file
+    save_tikz("throughput.tex", tikzplotlib.save)
\ No newline at end of file